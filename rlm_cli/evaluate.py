@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+import argparse
+import json
+import os
+
+from rlm_utils.env import apply_proxy_env, effective_model
+from rlm_utils.chrome_trace import ChromeTraceWriter
+from rlm_utils.metrics import add_metrics_args, start_exporters
+from rlm_utils.pathing import bootstrap_paths
+from rlm_utils.rlm_adapter import use_litellm
+from rlm_utils.evaluate import (
+    GRID_KEYS,
+    aggregate,
+    expand_grid,
+    fastest_meeting,
+    load_items,
+    print_pareto,
+    run_grid,
+    write_results,
+)
+
+
+def _csv(value: str, cast=str):
+    return [cast(v) for v in value.split(",") if v != ""]
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="Score a grid of RLM_REPL configs on a JSONL eval set")
+    ap.add_argument("--items", required=True, help="JSONL of {id, query, expected, context, match?}")
+    ap.add_argument("--grid", default=None, help=f"JSON file of {{param: [values]}} over: {', '.join(GRID_KEYS)}; overrides the flags below")
+    ap.add_argument("--models", default=None, help="comma-separated root models (default: LITELLM_MODEL)")
+    ap.add_argument("--recursive-models", default="", help="comma-separated sub-call models (default: same as root)")
+    ap.add_argument("--max-iters", default="4", help="comma-separated max_iterations values")
+    ap.add_argument("--max-depth", default="1", help="comma-separated max_depth values")
+    ap.add_argument("--max-chunk-chars", default="", help="comma-separated chunk caps for plan_chunks / llm_map_reduce (default: sized to the sub-model)")
+    ap.add_argument("--sub-parallelism", default="", help="comma-separated sub-call fan-out values (default: 8)")
+    ap.add_argument("--cascade", default="", help="comma-separated cheaper sub-call models tried before the recursive model (all configs)")
+    ap.add_argument("--workers", type=int, default=4, help="parallel runs")
+    ap.add_argument("--repeats", type=int, default=1, help="runs per (config, item)")
+    ap.add_argument("--target", type=float, default=None, help="report the fastest config reaching this accuracy")
+    ap.add_argument("--out", default="artifacts/eval_results.jsonl", help="per-run results JSONL")
+    ap.add_argument("--api-base", default=None)
+    add_metrics_args(ap)
+    ap.add_argument("--chrome-trace", default=None, help="stream a Chrome trace-event JSON timeline of the run here (open in ui.perfetto.dev)")
+    args = ap.parse_args()
+
+    bootstrap_paths()
+    use_litellm()
+    apply_proxy_env(args.api_base)
+
+    if args.grid:
+        with open(args.grid) as f:
+            grid = json.load(f)
+    else:
+        grid = {
+            "model": _csv(args.models) if args.models else [effective_model("gemini-2.5-flash-lite")],
+            "max_iterations": _csv(args.max_iters, int),
+            "max_depth": _csv(args.max_depth, int),
+        }
+        if args.recursive_models:
+            grid["recursive_model"] = _csv(args.recursive_models)
+        if args.max_chunk_chars:
+            grid["max_chunk_chars"] = _csv(args.max_chunk_chars, int)
+        if args.sub_parallelism:
+            grid["sub_parallelism"] = _csv(args.sub_parallelism, int)
+        if args.cascade:
+            grid["cascade_models"] = [args.cascade]
+    try:
+        configs = expand_grid(grid)
+    except ValueError as e:
+        ap.error(str(e))
+    items = load_items(args.items)
+    print(f"Running {len(configs)} configs x {len(items)} items x {args.repeats} repeats with {args.workers} workers...")
+
+    def _progress(r) -> None:
+        status = "ERR" if r.error else f"{r.score:.2f}"
+        print(f"  [{status}] {r.config_id} / {r.item_id} in {r.wall_s:.1f}s")
+
+    stop_metrics = start_exporters(args)
+    trace = ChromeTraceWriter(args.chrome_trace).start() if args.chrome_trace else None
+    try:
+        results = run_grid(
+            items,
+            configs,
+            workers=args.workers,
+            repeats=args.repeats,
+            base_dir=os.path.dirname(os.path.abspath(args.items)),
+            on_result=_progress,
+        )
+    finally:
+        stop_metrics()
+        if trace is not None:
+            trace.close()
+    write_results(results, args.out)
+    rows = aggregate(results)
+    print_pareto(rows)
+    if args.target is not None:
+        best = fastest_meeting(rows, args.target)
+        if best:
+            print(f"\nFastest config with accuracy >= {args.target}: {best['config_id']} ({best['wall_s']:.1f}s, acc {best['accuracy']:.2f})")
+        else:
+            print(f"\nNo config reached accuracy {args.target}")
+    print(f"\nPer-run results written to: {args.out}")
+
+
+if __name__ == "__main__":
+    main()
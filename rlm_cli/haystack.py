@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import time
+
+from rlm_utils.evaluate import haystack_items
+from rlm_utils.haystack import generate_haystack
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="Generate a seeded needle-in-a-haystack corpus")
+    ap.add_argument("--out", default="artifacts/haystack.txt", help="output text file")
+    ap.add_argument("--truth", default=None, help="ground-truth JSON path (default: <out>.truth.json)")
+    ap.add_argument("--lines", type=int, default=1_000_000, help="number of body lines")
+    ap.add_argument("--needles", type=int, default=1, help="number of needles to insert")
+    ap.add_argument("--template", default="The magic number is {value}")
+    ap.add_argument("--depth", default="uniform", help="uniform | normal | comma-separated fractions, e.g. 0.1,0.5")
+    ap.add_argument("--depth-range", default="0.1,0.9", help="lo,hi bounds for uniform/normal depths")
+    ap.add_argument("--docs", type=int, default=0, help="split into N Federalist-style documents (0 = flat lines)")
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--items", default=None, help="also append an rlm-eval item for this corpus to this JSONL")
+    args = ap.parse_args()
+
+    depth = args.depth
+    if depth not in ("uniform", "normal"):
+        depth = [float(x) for x in depth.split(",")]
+    lo, hi = (float(x) for x in args.depth_range.split(","))
+    truth_path = args.truth or args.out + ".truth.json"
+
+    t0 = time.perf_counter()
+    truth = generate_haystack(
+        args.out,
+        args.lines,
+        needles=args.needles,
+        template=args.template,
+        depth=depth,
+        depth_range=(lo, hi),
+        docs=args.docs,
+        seed=args.seed,
+        truth_path=truth_path,
+    )
+    dt = time.perf_counter() - t0
+    mb = truth.num_bytes / 1e6
+    print(f"Wrote {truth.num_lines:,} lines ({mb:.1f} MB) to {args.out} in {dt:.2f}s [{truth.backend}, {mb / max(dt, 1e-9):.0f} MB/s]")
+    for nd in truth.needles:
+        print(f"  needle {nd.index}: line {nd.line} (depth {nd.depth:.2f}) -> {nd.text}")
+    print(f"Ground truth written to: {truth_path}")
+    if args.items:
+        truth.path = os.path.abspath(args.out)
+        with open(args.items, "a") as f:
+            for item in haystack_items(truth):
+                f.write(json.dumps(item) + "\n")
+        print(f"Eval item appended to: {args.items}")
+
+
+if __name__ == "__main__":
+    main()
@@ -5,8 +5,10 @@ import os
 
 from rlm_utils.env import apply_proxy_env, effective_model
 from rlm_utils.pathing import bootstrap_paths
-from rlm_utils.rlm_adapter import monkey_patch_litellm, build_rlm
+from rlm_utils.rlm_adapter import use_litellm, build_rlm
+from rlm_utils.chrome_trace import ChromeTraceWriter
 from rlm_utils.event_log import get_logger, reset_logger
+from rlm_utils.metrics import add_metrics_args, start_exporters
 from rlm_utils.summary import print_summary
 from rlm_utils.sampling import small_sample_from_dir, small_sample_from_file
 
@@ -26,9 +28,22 @@ def main() -> None:
     )
     ap.add_argument("--max-iters", type=int, default=6)
     ap.add_argument("--max-depth", type=int, default=1, help="recursive depth for sub-LLM calls")
+    ap.add_argument("--cascade", default="", help="comma-separated cheaper sub-call models tried before the main model, escalating on weak answers")
     ap.add_argument("--all", action="store_true", help="include all file types (not only texty)")
     ap.add_argument("--log", action="store_true", help="print a concise per-iteration summary at the end")
+    ap.add_argument("--async-log", action="store_true", help="render console logs on a background thread (drops records if it falls behind)")
     ap.add_argument("--api-base", default=None, help="LiteLLM proxy base URL")
+    ap.add_argument("--exec-timeout", type=float, default=None, help="wall-clock seconds allowed per REPL code execution")
+    ap.add_argument("--exec-cpu", type=float, default=None, help="CPU seconds allowed per REPL code execution")
+    ap.add_argument("--exec-memory-mb", type=float, default=None, help="memory growth allowed per REPL code execution (MB)")
+    ap.add_argument(
+        "--exec-isolation",
+        choices=["thread", "process"],
+        default="thread",
+        help="enforce exec limits in-process (thread) or in a forked worker with hard rlimits (process)",
+    )
+    add_metrics_args(ap)
+    ap.add_argument("--chrome-trace", default=None, help="stream a Chrome trace-event JSON timeline of the run here (open in ui.perfetto.dev)")
     args = ap.parse_args()
 
     # Prepare tiny context
@@ -39,19 +54,51 @@ def main() -> None:
 
     # Env + model + RLM
     bootstrap_paths()
-    monkey_patch_litellm()
+    use_litellm()
     apply_proxy_env(args.api_base)
     model = effective_model("gemini-2.5-flash-lite")
-    rlm = build_rlm(model, max_iterations=args.max_iters, enable_logging=True, max_depth=args.max_depth)
+    exec_limits = None
+    if args.exec_timeout or args.exec_cpu or args.exec_memory_mb:
+        from rlm.repl import ExecLimits  # type: ignore
+
+        exec_limits = ExecLimits(
+            wall_s=args.exec_timeout,
+            cpu_s=args.exec_cpu,
+            memory_mb=args.exec_memory_mb,
+            isolation=args.exec_isolation,
+        )
+    rlm = build_rlm(
+        model,
+        max_iterations=args.max_iters,
+        enable_logging=True,
+        max_depth=args.max_depth,
+        exec_limits=exec_limits,
+        async_logging=args.async_log,
+        cascade_models=[m.strip() for m in args.cascade.split(",") if m.strip()],
+    )
 
     print("Running RLM_REPL on a tiny sampled context...\n")
     reset_logger()
-    result = rlm.completion(context=context, query=args.query)
+    stop_metrics = start_exporters(args)
+    trace = ChromeTraceWriter(args.chrome_trace).start() if args.chrome_trace else None
+    try:
+        result = rlm.completion(context=context, query=args.query)
+    finally:
+        stop_metrics()
+        if trace is not None:
+            trace.close()
+            print(f"Chrome trace written to: {args.chrome_trace}")
     print("\n=== FINAL ANSWER ===\n" + str(result))
     if args.log:
         print("\n=== RUN SUMMARY ===")
         events = get_logger().dump()
         print_summary(events)
+        for tier in rlm.cascade_summary():
+            reasons = ", ".join(f"{k}={v}" for k, v in tier["reasons"].items())
+            print(
+                f"cascade {tier['model']}: {tier['calls']} calls, {tier['escalated']} escalated"
+                f"{f' ({reasons})' if reasons else ''}, mean {tier['mean_latency_s']}s"
+            )
 
 
 if __name__ == "__main__":
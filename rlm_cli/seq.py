@@ -5,7 +5,7 @@ import os
 
 from rlm_utils.env import apply_proxy_env, effective_model
 from rlm_utils.pathing import bootstrap_paths
-from rlm_utils.rlm_adapter import monkey_patch_litellm, build_rlm
+from rlm_utils.rlm_adapter import use_litellm, build_rlm
 from rlm_utils.sampling import small_sample_from_dir, small_sample_from_file
 from rlm_utils.sequence import export_sequence_mermaid
 from rlm_utils.event_log import get_logger, reset_logger
@@ -35,7 +35,7 @@ def main() -> None:
 
     # Env + model
     bootstrap_paths()
-    monkey_patch_litellm()
+    use_litellm()
     apply_proxy_env(args.api_base)
     model = effective_model("gemini-2.5-flash-lite")
     rlm = build_rlm(model, max_iterations=args.max_iters, enable_logging=False, max_depth=args.max_depth)
@@ -5,9 +5,11 @@ import os
 
 from rlm_utils.env import apply_proxy_env, effective_model
 from rlm_utils.pathing import bootstrap_paths
-from rlm_utils.rlm_adapter import monkey_patch_litellm, build_rlm
+from rlm_utils.rlm_adapter import use_litellm, build_rlm
 from rlm_utils.sampling import small_sample_from_dir, small_sample_from_file
 from rlm_utils.tracing import run_with_trace, render_cli_tree, export_mermaid
+from rlm_utils.event_log import get_logger, reset_logger
+from rlm_utils.chrome_trace import export_chrome_trace
 
 
 def main() -> None:
@@ -30,6 +32,7 @@ def main() -> None:
         help="regex of functions/files to exclude",
     )
     ap.add_argument("--top", type=int, default=8, help="print top-N heaviest edges")
+    ap.add_argument("--chrome", default=None, help="also write a Chrome trace-event timeline (spans + traced calls), e.g. artifacts/trace.json")
     args = ap.parse_args()
 
     # Build context
@@ -40,7 +43,7 @@ def main() -> None:
 
     # Env + model
     bootstrap_paths()
-    monkey_patch_litellm()
+    use_litellm()
     apply_proxy_env(args.api_base)
     model = effective_model("gemini-2.5-flash-lite")
     rlm = build_rlm(model, max_iterations=args.max_iters, enable_logging=False, max_depth=args.max_depth)
@@ -49,6 +52,7 @@ def main() -> None:
     def _run():
         return rlm.completion(context=context, query=args.query)
 
+    reset_logger()
     result, roots, edges = run_with_trace(_run)
 
     print("\n=== FINAL ANSWER ===\n", result)
@@ -62,6 +66,9 @@ def main() -> None:
     if args.mermaid:
         export_mermaid(edges, args.mermaid, min_ms=args.min_ms, exclude_patterns=args.exclude)
         print(f"\nMermaid call graph written to: {args.mermaid}")
+    if args.chrome:
+        n = export_chrome_trace(get_logger().events, args.chrome, call_records=roots)
+        print(f"Chrome trace ({n} events) written to: {args.chrome}")
 
 
 if __name__ == "__main__":
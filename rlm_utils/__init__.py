@@ -4,7 +4,11 @@ Modules:
 - pathing: ensure vendor path on sys.path
 - env: load .env, normalize proxy base, align keys
 - sampling: file/directory small sampling helpers
-- rlm_adapter: monkey‑patch LiteLLM client + build RLM_REPL
+- rlm_adapter: select the LiteLLM client (lazy registry) + build RLM_REPL
 - tracing: lightweight function call tracer + Mermaid export
+- chrome_trace: run timeline (event-log spans, traced calls) as Chrome trace-event JSON
+- haystack: seeded needle-in-a-haystack corpus generator (NumPy when available)
+- evaluate: score RLM config grids on JSONL items, Pareto table of accuracy vs cost
+- metrics: live latency histograms/counters, Prometheus endpoint + snapshot files
 """
 
@@ -0,0 +1,145 @@
+"""Chrome trace-event export of a run timeline (open in https://ui.perfetto.dev or chrome://tracing).
+
+Event-log "span" events become begin/end slices per thread (root LM calls, REPL
+executions, sub-LLM calls, map-reduce rounds, whole RLM sessions), other events
+become instant markers, and tracer CallRecords become complete ("X") slices.
+Session, depth and model travel in each slice's args.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from typing import Any, Dict, Iterable, Iterator, Optional, Union
+
+from .event_log import Event, add_sink, remove_sink
+
+PREVIEW_CHARS = 200
+
+
+def _args(data: Dict[str, Any]) -> Dict[str, Any]:
+    out = {}
+    for k, v in data.items():
+        if isinstance(v, str) and len(v) > PREVIEW_CHARS:
+            v = v[:PREVIEW_CHARS] + "…"
+        elif not isinstance(v, (str, int, float, bool, type(None))):
+            v = str(v)[:PREVIEW_CHARS]
+        out[k] = v
+    return out
+
+
+def trace_event(event: Union[Event, Dict[str, Any]]) -> Dict[str, Any]:
+    """One event-log entry (an Event or a `dump()` dict) as a Chrome trace event."""
+    if isinstance(event, Event):
+        kind, t, pid, tid, data = event.kind, event.t, event.pid, event.tid, dict(event.data)
+    else:
+        data = dict(event)
+        kind, t = data.pop("kind"), data.pop("t")
+        pid, tid = data.pop("pid", 0), data.pop("tid", 0)
+    out: Dict[str, Any] = {"ts": round(t * 1e6, 3), "pid": pid, "tid": tid}
+    if kind == "span":
+        out["ph"] = data.pop("ph")
+        out["name"] = data.pop("name")
+        out["cat"] = "rlm"
+        if data:
+            out["args"] = _args(data)
+    else:
+        out.update(ph="i", s="t", name=kind, cat="event", args=_args(data))
+    return out
+
+
+def call_record_events(roots: Iterable[Any], *, clock_offset: Optional[float] = None) -> Iterator[Dict[str, Any]]:
+    """Complete ("X") slices for tracer CallRecords (see tracing.run_with_trace).
+
+    CallRecords are timed with perf_counter; `clock_offset` maps that onto the
+    event log's wall clock (default: the current difference between the two)."""
+    if clock_offset is None:
+        clock_offset = time.time() - time.perf_counter()
+    pid = os.getpid()
+    stack = list(roots)
+    while stack:
+        rec = stack.pop()
+        yield {
+            "ph": "X",
+            "name": rec.func.rsplit(".", 1)[-1],
+            "cat": "call",
+            "ts": round((rec.started_at + clock_offset) * 1e6, 3),
+            "dur": round(rec.duration * 1e6, 3),
+            "pid": pid,
+            "tid": getattr(rec, "tid", 0),
+            "args": {"func": rec.func, "file": f"{os.path.basename(rec.file)}:{rec.line}"},
+        }
+        stack.extend(rec.children)
+
+
+class ChromeTraceWriter:
+    """
+    Streams trace events to `path` while the run is going (JSON array format: the
+    file is loadable even if the run dies before close() writes the closing bracket).
+    Attach it to the event log with start(); flushes at most every `flush_s` seconds.
+    """
+
+    def __init__(self, path: str, flush_s: float = 1.0):
+        d = os.path.dirname(path)
+        if d:
+            os.makedirs(d, exist_ok=True)
+        self.path = path
+        self.flush_s = flush_s
+        self.count = 0
+        self._lock = threading.Lock()
+        self._f = open(path, "w")
+        self._f.write("[")
+        self._last_flush = time.monotonic()
+        self._pids: set = set()
+
+    def write(self, trace_ev: Dict[str, Any]) -> None:
+        with self._lock:
+            if self._f.closed:
+                return
+            if trace_ev["pid"] not in self._pids:
+                self._pids.add(trace_ev["pid"])
+                self._emit({"ph": "M", "name": "process_name", "pid": trace_ev["pid"], "tid": 0, "args": {"name": f"rlm ({trace_ev['pid']})"}})
+            self._emit(trace_ev)
+            now = time.monotonic()
+            if now - self._last_flush >= self.flush_s:
+                self._f.flush()
+                self._last_flush = now
+
+    def _emit(self, trace_ev: Dict[str, Any]) -> None:
+        self._f.write(("\n" if self.count == 0 else ",\n") + json.dumps(trace_ev, default=str))
+        self.count += 1
+
+    def __call__(self, event: Event) -> None:
+        self.write(trace_event(event))
+
+    def start(self) -> "ChromeTraceWriter":
+        """Receive every event-log event from now on."""
+        add_sink(self)
+        return self
+
+    def close(self) -> None:
+        remove_sink(self)
+        with self._lock:
+            if not self._f.closed:
+                self._f.write("\n]\n")
+                self._f.close()
+
+
+def export_chrome_trace(
+    events: Iterable[Union[Event, Dict[str, Any]]],
+    outfile: str,
+    *,
+    call_records: Optional[Iterable[Any]] = None,
+) -> int:
+    """Write a complete trace file from logged events (and optional tracer records); returns the event count."""
+    writer = ChromeTraceWriter(outfile)
+    try:
+        for e in events:
+            writer.write(trace_event(e))
+        for ev in call_record_events(call_records or []):
+            writer.write(ev)
+    finally:
+        writer.close()
+    return writer.count
@@ -0,0 +1,371 @@
+"""Accuracy-vs-cost evaluation of RLM configurations.
+
+Items are JSONL rows: {"id", "query", "expected", "context", "match"?}, where
+`expected` is a string or a list of strings (all must appear) and `context` is
+one of:
+- a plain string (used verbatim) or {"text": ...}
+- {"file": path, "bytes": N?}  (first N bytes, or the whole file)
+- {"haystack": {generate_haystack kwargs}}  (generated once into a cache dir)
+
+Every (config, item) pair runs in a worker thread with its own scoped event
+logger, so wall time, LLM calls and tokens are attributed per run; configs are
+then aggregated and marked Pareto-optimal on accuracy vs wall time / tokens / calls.
+"""
+
+from __future__ import annotations
+
+import difflib
+import hashlib
+import itertools
+import json
+import os
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, asdict, field
+from typing import Any, Callable, Dict, List, Optional, Sequence, Union
+
+from .event_log import scoped_logger
+from .metrics import get_metrics
+from .pathing import bootstrap_paths, repo_root
+from .summary import run_totals
+
+DEFAULT_CACHE_DIR = os.path.join(repo_root(), "artifacts", "eval_cache")
+
+# Config keys default_rlm_factory understands (exec_* mirror rlm-run's --exec-* flags)
+GRID_KEYS = (
+    "model",
+    "recursive_model",
+    "cascade_models",
+    "max_iterations",
+    "max_depth",
+    "sub_parallelism",
+    "max_chunk_chars",
+    "exec_timeout",
+    "exec_cpu",
+    "exec_memory_mb",
+    "exec_isolation",
+)
+
+
+@dataclass
+class EvalItem:
+    id: str
+    query: str
+    expected: Union[str, List[str]]
+    context: Any
+    match: str = "contains"
+
+
+@dataclass
+class RunResult:
+    config_id: str
+    config: Dict[str, Any]
+    item_id: str
+    score: float
+    wall_s: float
+    answer_preview: str = ""
+    error: Optional[str] = None
+    totals: Dict[str, Any] = field(default_factory=dict)
+
+
+def load_items(path: str) -> List[EvalItem]:
+    items: List[EvalItem] = []
+    with open(path) as f:
+        for n, line in enumerate(f):
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            row = json.loads(line)
+            items.append(
+                EvalItem(
+                    id=str(row.get("id", n)),
+                    query=row["query"],
+                    expected=row["expected"],
+                    context=row["context"],
+                    match=row.get("match", "contains"),
+                )
+            )
+    return items
+
+
+def resolve_context(spec: Any, *, base_dir: str = ".", cache_dir: Optional[str] = None) -> str:
+    """Materialize an item's context spec into the string handed to RLM_REPL.
+
+    Generated haystacks are cached in `cache_dir` (default: artifacts/eval_cache
+    under the repo, wherever the process runs from).
+    """
+    cache_dir = cache_dir or DEFAULT_CACHE_DIR
+    if isinstance(spec, str):
+        return spec
+    if "text" in spec:
+        return spec["text"]
+    if "file" in spec:
+        path = spec["file"] if os.path.isabs(spec["file"]) else os.path.join(base_dir, spec["file"])
+        if spec.get("bytes"):
+            from .sampling import small_sample_from_file
+            return small_sample_from_file(path, int(spec["bytes"]))
+        with open(path, encoding="utf-8", errors="replace") as f:
+            return f.read()
+    if "haystack" in spec:
+        from .haystack import generate_haystack
+        params = dict(spec["haystack"])
+        key = hashlib.sha1(json.dumps(params, sort_keys=True).encode()).hexdigest()[:12]
+        path = os.path.join(cache_dir, f"haystack_{key}.txt")
+        if not os.path.exists(path):
+            generate_haystack(path, **params)
+        with open(path, encoding="utf-8") as f:
+            return f.read()
+    raise ValueError(f"Unsupported context spec: {sorted(spec)}")
+
+
+def normalize(text: str) -> str:
+    text = re.sub(r"[^\w\s]", " ", str(text).lower())
+    return " ".join(text.split())
+
+
+def score_answer(answer: Any, expected: Union[str, Sequence[str]], match: str = "contains", *, fuzzy_threshold: float = 0.8) -> float:
+    """Score in [0, 1]; list expectations score the fraction of expected strings matched.
+
+    - exact: normalized equality
+    - contains: normalized expected is a substring of the normalized answer
+    - fuzzy: contains, else best difflib ratio over answer windows >= fuzzy_threshold
+    """
+    targets = [expected] if isinstance(expected, str) else list(expected)
+    if not targets:
+        return 0.0
+    ans = normalize(answer or "")
+    hits = 0
+    for t in targets:
+        t = normalize(t)
+        if match == "exact":
+            ok = ans == t
+        elif match == "contains":
+            ok = t in ans
+        elif match == "fuzzy":
+            ok = t in ans or _best_window_ratio(ans, t) >= fuzzy_threshold
+        else:
+            raise ValueError(f"Unknown match mode: {match!r}")
+        hits += int(ok)
+    return hits / len(targets)
+
+
+def _best_window_ratio(answer: str, target: str) -> float:
+    words, n = answer.split(), max(1, len(target.split()))
+    if len(words) <= n:
+        return difflib.SequenceMatcher(None, answer, target).ratio()
+    return max(
+        difflib.SequenceMatcher(None, " ".join(words[i:i + n]), target).ratio()
+        for i in range(len(words) - n + 1)
+    )
+
+
+def expand_grid(grid: Dict[str, Sequence[Any]], known: Optional[Sequence[str]] = GRID_KEYS) -> List[Dict[str, Any]]:
+    """Cartesian product of {param: [values]} into a list of config dicts.
+
+    Keys outside `known` (default: what default_rlm_factory understands) raise
+    ValueError instead of producing configs that differ only in name; pass
+    known=None for a custom rlm_factory.
+    """
+    if known is not None:
+        unknown = sorted(set(grid) - set(known))
+        if unknown:
+            raise ValueError(f"Unknown grid key(s): {', '.join(unknown)} (supported: {', '.join(known)})")
+    keys = sorted(grid)
+    return [dict(zip(keys, combo)) for combo in itertools.product(*(grid[k] for k in keys))]
+
+
+def config_id(config: Dict[str, Any]) -> str:
+    return ",".join(f"{k}={config[k]}" for k in sorted(config))
+
+
+def default_rlm_factory(config: Dict[str, Any]) -> Any:
+    from .rlm_adapter import build_rlm
+    from .env import effective_model
+
+    model = config.get("model") or effective_model("gemini-2.5-flash-lite")
+    return build_rlm(
+        model,
+        max_iterations=int(config.get("max_iterations", 6)),
+        enable_logging=False,
+        max_depth=int(config.get("max_depth", 1)),
+        recursive_model=config.get("recursive_model"),
+        cascade_models=_models(config.get("cascade_models")),
+        exec_limits=_exec_limits(config),
+        sub_parallelism=int(config.get("sub_parallelism", 8)),
+        max_chunk_chars=int(config["max_chunk_chars"]) if config.get("max_chunk_chars") else None,
+    )
+
+
+def _exec_limits(config: Dict[str, Any]) -> Any:
+    """An ExecLimits from the exec_* config keys, or None when none is set."""
+    if not any(config.get(k) for k in ("exec_timeout", "exec_cpu", "exec_memory_mb")):
+        return None
+    bootstrap_paths()
+    from rlm.repl import ExecLimits  # type: ignore
+
+    def num(key: str) -> Optional[float]:
+        return float(config[key]) if config.get(key) else None
+
+    return ExecLimits(
+        wall_s=num("exec_timeout"),
+        cpu_s=num("exec_cpu"),
+        memory_mb=num("exec_memory_mb"),
+        isolation=config.get("exec_isolation") or "thread",
+    )
+
+
+def _models(value: Any) -> List[str]:
+    """A model list from a grid value: a list or a comma-separated string."""
+    if not value:
+        return []
+    if isinstance(value, str):
+        return [m.strip() for m in value.split(",") if m.strip()]
+    return list(value)
+
+
+def run_grid(
+    items: Sequence[EvalItem],
+    configs: Sequence[Dict[str, Any]],
+    *,
+    workers: int = 4,
+    repeats: int = 1,
+    rlm_factory: Callable[[Dict[str, Any]], Any] = default_rlm_factory,
+    base_dir: str = ".",
+    on_result: Optional[Callable[[RunResult], None]] = None,
+) -> List[RunResult]:
+    """Run every config on every item (`repeats` times) in a thread pool."""
+    contexts = {it.id: resolve_context(it.context, base_dir=base_dir) for it in items}
+
+    def _run(config: Dict[str, Any], item: EvalItem, submitted: float) -> RunResult:
+        get_metrics().observe("rlm_queue_wait_seconds", time.perf_counter() - submitted, queue="eval")
+        with scoped_logger() as log:
+            t0 = time.perf_counter()
+            answer, error = None, None
+            try:
+                rlm = rlm_factory(config)
+                answer = rlm.completion(context=contexts[item.id], query=item.query)
+            except Exception as e:
+                error = f"{type(e).__name__}: {e}"
+            wall = time.perf_counter() - t0
+            events = log.dump()
+        return RunResult(
+            config_id=config_id(config),
+            config=dict(config),
+            item_id=item.id,
+            score=score_answer(answer, item.expected, item.match) if error is None else 0.0,
+            wall_s=wall,
+            answer_preview=str(answer)[:200] if answer is not None else "",
+            error=error,
+            totals=run_totals(events),
+        )
+
+    results: List[RunResult] = []
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        futures = [
+            pool.submit(_run, cfg, item, time.perf_counter())
+            for cfg in configs
+            for item in items
+            for _ in range(repeats)
+        ]
+        for fut in as_completed(futures):
+            res = fut.result()
+            results.append(res)
+            if on_result is not None:
+                on_result(res)
+    return results
+
+
+def aggregate(results: Sequence[RunResult]) -> List[Dict[str, Any]]:
+    """Per-config means, with a `pareto` flag for non-dominated configs."""
+    by_cfg: Dict[str, List[RunResult]] = {}
+    for r in results:
+        by_cfg.setdefault(r.config_id, []).append(r)
+    rows: List[Dict[str, Any]] = []
+    for cid, rs in by_cfg.items():
+        n = len(rs)
+        rows.append(
+            dict(
+                config_id=cid,
+                config=rs[0].config,
+                runs=n,
+                errors=sum(1 for r in rs if r.error),
+                accuracy=sum(r.score for r in rs) / n,
+                wall_s=sum(r.wall_s for r in rs) / n,
+                total_tokens=sum(int(r.totals.get("total_tokens", 0)) for r in rs) / n,
+                llm_calls=sum(int(r.totals.get("llm_calls", 0)) for r in rs) / n,
+            )
+        )
+    mark_pareto(rows)
+    rows.sort(key=lambda r: (-r["accuracy"], r["wall_s"]))
+    return rows
+
+
+def mark_pareto(rows: List[Dict[str, Any]], costs: Sequence[str] = ("wall_s", "total_tokens", "llm_calls")) -> None:
+    """Flag rows not dominated on (higher accuracy, lower costs)."""
+    def dominates(a: Dict[str, Any], b: Dict[str, Any]) -> bool:
+        no_worse = a["accuracy"] >= b["accuracy"] and all(a[c] <= b[c] for c in costs)
+        better = a["accuracy"] > b["accuracy"] or any(a[c] < b[c] for c in costs)
+        return no_worse and better
+
+    for r in rows:
+        r["pareto"] = not any(dominates(o, r) for o in rows if o is not r)
+
+
+def fastest_meeting(rows: Sequence[Dict[str, Any]], target: float) -> Optional[Dict[str, Any]]:
+    """Lowest mean wall time among configs whose accuracy reaches `target`."""
+    ok = [r for r in rows if r["accuracy"] >= target]
+    return min(ok, key=lambda r: r["wall_s"]) if ok else None
+
+
+def print_pareto(rows: Sequence[Dict[str, Any]]) -> None:
+    try:
+        from rich.table import Table
+        from rich.console import Console
+    except Exception:
+        for r in rows:
+            print({k: v for k, v in r.items() if k != "config"})
+        return
+    table = Table(title="RLM config accuracy vs cost")
+    table.add_column("pareto")
+    table.add_column("config")
+    table.add_column("runs", justify="right")
+    table.add_column("acc", justify="right")
+    table.add_column("wall_s", justify="right")
+    table.add_column("tokens", justify="right")
+    table.add_column("llm_calls", justify="right")
+    table.add_column("errors", justify="right")
+    for r in rows:
+        table.add_row(
+            "*" if r["pareto"] else "",
+            r["config_id"],
+            str(r["runs"]),
+            f"{r['accuracy']:.2f}",
+            f"{r['wall_s']:.1f}",
+            f"{r['total_tokens']:.0f}",
+            f"{r['llm_calls']:.1f}",
+            str(r["errors"]),
+        )
+    Console().print(table)
+
+
+def write_results(results: Sequence[RunResult], path: str) -> None:
+    d = os.path.dirname(path)
+    if d:
+        os.makedirs(d, exist_ok=True)
+    with open(path, "w") as f:
+        for r in results:
+            f.write(json.dumps(asdict(r)) + "\n")
+
+
+def haystack_items(truth: Any, *, query: str = "I'm looking for a magic number. What is it?", id_prefix: str = "haystack") -> List[Dict[str, Any]]:
+    """Eval rows for a generated haystack file: one item expecting every needle value."""
+    return [
+        dict(
+            id=f"{id_prefix}-{os.path.basename(truth.path or 'corpus')}",
+            query=query,
+            expected=[nd.value for nd in truth.needles],
+            context={"file": truth.path},
+            match="contains",
+        )
+    ]
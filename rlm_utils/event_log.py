@@ -1,7 +1,11 @@
 from __future__ import annotations
 
-from dataclasses import dataclass, asdict
-from typing import Any, Dict, List, Optional
+from contextlib import contextmanager
+from dataclasses import dataclass, asdict, field
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+import itertools
+import os
+import threading
 import time
 
 
@@ -10,6 +14,26 @@ class Event:
     kind: str
     t: float
     data: Dict[str, Any]
+    pid: int = field(default_factory=os.getpid)
+    tid: int = field(default_factory=threading.get_native_id)
+
+
+# Callables fed every event as it is logged (e.g. a streaming trace writer)
+_SINKS: List[Callable[[Event], None]] = []
+
+
+def add_sink(sink: Callable[[Event], None]) -> None:
+    _SINKS.append(sink)
+
+
+def remove_sink(sink: Callable[[Event], None]) -> None:
+    if sink in _SINKS:
+        _SINKS.remove(sink)
+
+
+if hasattr(os, "register_at_fork"):
+    # A forked REPL worker ships its events back to the parent, which feeds the sinks
+    os.register_at_fork(after_in_child=_SINKS.clear)
 
 
 class EventLogger:
@@ -17,16 +41,53 @@ class EventLogger:
         self.events: List[Event] = []
 
     def add(self, kind: str, **data: Any) -> None:
-        self.events.append(Event(kind=kind, t=time.time(), data=data))
+        self._record(Event(kind=kind, t=time.time(), data=data))
+
+    def extend(self, events: Iterable[Event]) -> None:
+        """Append events recorded elsewhere (e.g. in a forked worker)."""
+        for e in events:
+            self._record(e)
+
+    def _record(self, event: Event) -> None:
+        self.events.append(event)
+        for sink in list(_SINKS):
+            try:
+                sink(event)
+            except Exception:
+                pass
+
+    @contextmanager
+    def span(self, name: str, *, new_session: bool = False, **data: Any) -> Iterator[None]:
+        """
+        Log "span" begin/end events (ph="B"/"E") around the block on this thread.
+        With new_session, the block runs under a fresh session ID (its parent recorded).
+        """
+        prev = current_session()
+        if new_session:
+            data["parent_session"] = prev
+            _LOCAL.session = f"{os.getpid()}-{next(_SESSION_IDS)}"
+        self.add("span", ph="B", name=name, session=current_session(), **data)
+        try:
+            yield
+        finally:
+            self.add("span", ph="E", name=name)
+            if new_session:
+                _LOCAL.session = prev
 
     def dump(self) -> List[Dict[str, Any]]:
-        return [dict(kind=e.kind, t=e.t, **e.data) for e in self.events]
+        return [dict(kind=e.kind, t=e.t, pid=e.pid, tid=e.tid, **e.data) for e in self.events]
 
 
 _LOGGER: Optional[EventLogger] = None
+_LOCAL = threading.local()
+_SESSION_IDS = itertools.count(1)
 
 
 def get_logger() -> EventLogger:
+    """Return the calling thread's scoped logger (see `scoped_logger`), else the global one."""
+    scoped = getattr(_LOCAL, "logger", None)
+    if scoped is not None:
+        return scoped
     global _LOGGER
     if _LOGGER is None:
         _LOGGER = EventLogger()
@@ -37,3 +98,30 @@ def reset_logger() -> None:
     global _LOGGER
     _LOGGER = EventLogger()
 
+
+@contextmanager
+def scoped_logger(logger: Optional[EventLogger] = None) -> Iterator[EventLogger]:
+    """Route this thread's events to a private logger, e.g. one per parallel evaluation run."""
+    logger = logger or EventLogger()
+    prev = getattr(_LOCAL, "logger", None)
+    _LOCAL.logger = logger
+    try:
+        yield logger
+    finally:
+        _LOCAL.logger = prev
+
+
+def current_session() -> Optional[str]:
+    """Session ID of the innermost `span(..., new_session=True)` on this thread."""
+    return getattr(_LOCAL, "session", None)
+
+
+@contextmanager
+def session_scope(session: Optional[str]) -> Iterator[None]:
+    """Attribute this thread's spans to `session` (for worker threads of a session)."""
+    prev = current_session()
+    _LOCAL.session = session
+    try:
+        yield
+    finally:
+        _LOCAL.session = prev
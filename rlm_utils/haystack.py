@@ -0,0 +1,325 @@
+"""Seeded needle-in-a-haystack corpus generator for benchmarking.
+
+Streams lines straight to a binary file in chunks (memory stays O(chunk)),
+vectorized with NumPy when it is installed and falling back to the stdlib
+`random` module otherwise. The same seed reproduces the same corpus for a
+given backend. Needle positions are returned (and optionally written as
+JSON) as ground truth.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import random
+from dataclasses import dataclass, asdict, field
+from typing import Any, BinaryIO, Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+try:
+    import numpy as np  # optional: several times faster generation
+except Exception:  # pragma: no cover
+    np = None
+
+
+DEFAULT_WORDS = ["blah", "random", "text", "data", "content", "information", "sample"]
+
+# Vocabulary and header pieces for Federalist-style documents (see data/fed_papers.txt)
+PROSE_WORDS = [
+    "the", "of", "to", "and", "in", "a", "be", "that", "which", "is", "it", "by", "as", "this",
+    "power", "government", "states", "people", "union", "constitution", "federal", "national",
+    "authority", "legislature", "public", "liberty", "interest", "convention", "confederacy",
+    "executive", "laws", "members", "would", "may", "must", "will", "not", "every", "such",
+]
+AUTHORS = ["HAMILTON", "MADISON", "JAY"]
+TITLE_WORDS = [
+    "Concerning", "Dangers", "Foreign", "Force", "Influence", "Powers", "Union", "Senate",
+    "Judiciary", "Executive", "Taxation", "Defense", "Objections", "Considered", "Continued",
+]
+
+
+@dataclass
+class Needle:
+    index: int
+    value: str
+    text: str
+    line: int  # 0-based line number in the output file
+    offset: int  # byte offset of the needle line in the output file
+    depth: float  # requested relative position in the body lines (0..1)
+    doc: Optional[int] = None
+
+
+@dataclass
+class HaystackTruth:
+    path: Optional[str]
+    seed: int
+    backend: str
+    num_lines: int  # lines actually written, including document headers
+    num_bytes: int
+    needles: List[Needle] = field(default_factory=list)
+    docs: List[Dict[str, Any]] = field(default_factory=list)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+def to_roman(n: int) -> str:
+    vals = [(1000, "M"), (900, "CM"), (500, "D"), (400, "CD"), (100, "C"), (90, "XC"),
+            (50, "L"), (40, "XL"), (10, "X"), (9, "IX"), (5, "V"), (4, "IV"), (1, "I")]
+    out = []
+    for v, sym in vals:
+        while n >= v:
+            out.append(sym)
+            n -= v
+    return "".join(out)
+
+
+def sample_depths(n: int, depth: Union[str, Sequence[float]], rng: random.Random, *, depth_range: Tuple[float, float] = (0.1, 0.9)) -> List[float]:
+    """Relative needle depths in [0, 1): 'uniform' / 'normal' within depth_range, or an explicit list."""
+    lo, hi = depth_range
+    if isinstance(depth, str):
+        if depth == "uniform":
+            return [rng.uniform(lo, hi) for _ in range(n)]
+        if depth == "normal":
+            mid, sd = (lo + hi) / 2.0, (hi - lo) / 6.0
+            return [min(hi, max(lo, rng.gauss(mid, sd))) for _ in range(n)]
+        raise ValueError(f"Unknown depth distribution: {depth!r}")
+    depths = [float(d) for d in depth]
+    if len(depths) != n:
+        raise ValueError(f"Got {len(depths)} depths for {n} needles")
+    return depths
+
+
+class _LineBlocks:
+    """Produces encoded blocks of random word lines; empty lines act as paragraph breaks."""
+
+    def __init__(self, words: Sequence[str], min_words: int, max_words: int, blank_prob: float, seed: int, backend: Optional[str] = None):
+        self.words = list(words)
+        self.min_words = min_words
+        self.max_words = max_words
+        self.blank_prob = blank_prob
+        if backend is None:
+            backend = "numpy" if np is not None else "python"
+        if backend not in ("numpy", "python"):
+            raise ValueError(f"Unknown haystack backend: {backend!r}")
+        if backend == "numpy" and np is None:
+            raise ImportError("The numpy backend needs numpy (pip install 'recursive-llm-experiments[numpy]')")
+        if backend == "numpy":
+            self.backend = "numpy"
+            self.rng = np.random.default_rng(seed)
+            # Every word is stored with its trailing space; the extra empty entry
+            # (id == len(words)) renders a blank line.
+            encoded = [w.encode("utf-8") + b" " for w in self.words] + [b" "]
+            self.flat = np.frombuffer(b"".join(encoded), dtype=np.uint8)
+            self.tok_len = np.array([len(e) for e in encoded], dtype=np.int64)
+            self.tok_off = np.cumsum(self.tok_len) - self.tok_len
+        else:
+            self.backend = "python"
+            self.rng = random.Random(seed)
+
+    def block(self, n: int) -> Tuple[bytes, Sequence[int]]:
+        """Return (data, line_starts) for `n` lines; line_starts has n + 1 entries."""
+        if self.backend == "numpy":
+            return self._block_numpy(n)
+        return self._block_python(n)
+
+    def _block_python(self, n: int) -> Tuple[bytes, List[int]]:
+        rng = self.rng
+        lines = []
+        for _ in range(n):
+            if self.blank_prob and rng.random() < self.blank_prob:
+                lines.append("")
+            else:
+                lines.append(" ".join(rng.choices(self.words, k=rng.randint(self.min_words, self.max_words))))
+        starts = [0]
+        for ln in lines:
+            starts.append(starts[-1] + len(ln) + 1)
+        return ("\n".join(lines) + "\n").encode("utf-8"), starts
+
+    def _block_numpy(self, n: int) -> Tuple[bytes, Sequence[int]]:
+        rng = self.rng
+        counts = rng.integers(self.min_words, self.max_words + 1, size=n)
+        blanks = rng.random(n) < self.blank_prob if self.blank_prob else None
+        if blanks is not None:
+            counts[blanks] = 1
+        tokens = rng.integers(0, len(self.words), size=int(counts.sum()))
+        first = np.cumsum(counts) - counts
+        if blanks is not None:
+            tokens[first[blanks]] = len(self.words)
+
+        # One gather: output byte i copies flat[tok_off[token] + (i - token_start)]
+        tok_len = self.tok_len[tokens]
+        tok_end = np.cumsum(tok_len)
+        src = np.repeat(self.tok_off[tokens] - (tok_end - tok_len), tok_len)
+        src += np.arange(int(tok_end[-1]))
+        buf = self.flat[src]
+        # The last token's trailing space becomes the newline
+        line_end = tok_end[first + counts - 1]
+        buf[line_end - 1] = ord("\n")
+        line_start = np.zeros(n + 1, dtype=np.int64)
+        line_start[1:] = line_end
+        return buf.tobytes(), line_start
+
+
+def _doc_header(number: int, author: str, rng: random.Random) -> List[str]:
+    title = " ".join(rng.choice(TITLE_WORDS) for _ in range(rng.randint(2, 5)))
+    return [
+        "THE FEDERALIST.",
+        f"No. {to_roman(number)}.",
+        "",
+        title,
+        "",
+        "For the Independent Journal.",
+        "",
+        author,
+        "",
+        "",
+        "To the People of the State of New York:",
+        "",
+    ]
+
+
+def _plan_needle_lines(depths: Sequence[float], num_lines: int, *, explicit: bool) -> Dict[int, int]:
+    """Body line index -> needle index. Sampled depths that land on a taken line move to
+    the next free line (wrapping); explicit depths that collide are an error."""
+    if len(depths) > num_lines:
+        raise ValueError(f"{len(depths)} needles don't fit in {num_lines} lines")
+    planned: Dict[int, int] = {}
+    for i, d in enumerate(depths):
+        line = min(num_lines - 1, max(0, int(d * num_lines)))
+        if line in planned:
+            if explicit:
+                raise ValueError(f"Needles {planned[line]} and {i} both land on body line {line}")
+            while line in planned:
+                line = (line + 1) % num_lines
+        planned[line] = i
+    return planned
+
+
+def generate_haystack(
+    out: Union[str, BinaryIO],
+    num_lines: int = 1_000_000,
+    *,
+    needles: Union[int, Sequence[str]] = 1,
+    template: str = "The magic number is {value}",
+    depth: Union[str, Sequence[float]] = "uniform",
+    depth_range: Tuple[float, float] = (0.1, 0.9),
+    docs: int = 0,
+    words: Optional[Sequence[str]] = None,
+    min_words: Optional[int] = None,
+    max_words: Optional[int] = None,
+    blank_prob: Optional[float] = None,
+    seed: int = 0,
+    chunk_lines: int = 1 << 16,
+    truth_path: Optional[str] = None,
+    backend: Optional[str] = None,
+) -> HaystackTruth:
+    """Write a haystack of `num_lines` body lines to `out` (path or binary file) and return its ground truth.
+
+    - needles: count of random 7-digit values, or explicit values; each replaces one body line
+      rendered with `template` (`{value}` and `{index}` are available).
+    - depth / depth_range: where needles land, as a fraction of the body lines.
+    - docs: when > 0, split the body into that many Federalist-style documents with
+      `THE FEDERALIST. / No. N.` headers (header lines are extra, not part of `num_lines`).
+      Word/line defaults then follow the prose shape (8-13 words, ~7% blank paragraph breaks)
+      instead of main.py's flat 3-8 word lines.
+    - truth_path: optionally also dump the ground truth as JSON.
+    - backend: "numpy" or "python" (default: numpy when installed).
+    """
+    meta_rng = random.Random(seed)
+    if isinstance(needles, int):
+        values = [str(meta_rng.randint(1_000_000, 9_999_999)) for _ in range(needles)]
+    else:
+        values = [str(v) for v in needles]
+    depths = sample_depths(len(values), depth, meta_rng, depth_range=depth_range)
+    planned = _plan_needle_lines(depths, num_lines, explicit=not isinstance(depth, str))
+
+    if words is None:
+        words = PROSE_WORDS if docs else DEFAULT_WORDS
+    if min_words is None:
+        min_words = 8 if docs else 3
+    if max_words is None:
+        max_words = 13 if docs else 8
+    if blank_prob is None:
+        blank_prob = 0.07 if docs else 0.0
+    gen = _LineBlocks(words, min_words, max_words, blank_prob, seed, backend)
+
+    # Document boundaries over body lines
+    doc_starts: List[int] = []
+    if docs:
+        per_doc = max(1, num_lines // docs)
+        doc_starts = [i * per_doc for i in range(min(docs, num_lines))]
+
+    path = out if isinstance(out, str) else None
+    if path:
+        d = os.path.dirname(path)
+        if d:
+            os.makedirs(d, exist_ok=True)
+    f = open(path, "wb") if path else out
+    truth = HaystackTruth(path=path, seed=seed, backend=gen.backend, num_lines=0, num_bytes=0)
+    needle_objs: Dict[int, Needle] = {}
+    try:
+        line_no = 0
+        offset = 0
+        body = 0
+        next_doc = 0
+        while body < num_lines:
+            if next_doc < len(doc_starts) and body == doc_starts[next_doc]:
+                author = meta_rng.choice(AUTHORS)
+                truth.docs.append(dict(doc=next_doc, number=next_doc + 1, author=author, line=line_no, offset=offset))
+                header = ("\n".join(_doc_header(next_doc + 1, author, meta_rng)) + "\n").encode("utf-8")
+                f.write(header)
+                line_no += header.count(b"\n")
+                offset += len(header)
+                next_doc += 1
+            end = num_lines
+            if next_doc < len(doc_starts):
+                end = doc_starts[next_doc]
+            n = min(chunk_lines, end - body)
+            data, starts = gen.block(n)
+            hits = [b for b in planned if body <= b < body + n]
+            if hits:
+                parts = []
+                prev = 0
+                for b in sorted(hits):
+                    i = planned[b]
+                    j = b - body
+                    text = template.format(value=values[i], index=i)
+                    parts.append(data[prev:int(starts[j])])
+                    pos = offset + sum(len(p) for p in parts)
+                    needle_objs[i] = Needle(
+                        index=i, value=values[i], text=text, line=line_no + j, offset=pos,
+                        depth=depths[i], doc=(next_doc - 1) if doc_starts else None,
+                    )
+                    parts.append((text + "\n").encode("utf-8"))
+                    prev = int(starts[j + 1])
+                parts.append(data[prev:])
+                data = b"".join(parts)
+            f.write(data)
+            offset += len(data)
+            line_no += n
+            body += n
+    finally:
+        if path:
+            f.close()
+    truth.num_lines = line_no
+    truth.num_bytes = offset
+    truth.needles = [needle_objs[i] for i in sorted(needle_objs)]
+    if truth_path:
+        write_truth(truth, truth_path)
+    return truth
+
+
+def write_truth(truth: HaystackTruth, path: str) -> None:
+    d = os.path.dirname(path)
+    if d:
+        os.makedirs(d, exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(truth.to_dict(), f, indent=2)
+
+
+def iter_needle_lines(path: str, truth: HaystackTruth) -> Iterator[Tuple[Needle, str]]:
+    """Yield (needle, line read back at its recorded offset) — handy for sanity checks."""
+    with open(path, "rb") as f:
+        for nd in truth.needles:
+            f.seek(nd.offset)
+            yield nd, f.readline().decode("utf-8").rstrip("\n")
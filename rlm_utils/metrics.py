@@ -0,0 +1,307 @@
+"""Live, low-overhead metrics for RLM runs.
+
+Histograms, counters and gauges keyed by label values, updated in place under
+one lock (no per-event records) and timed with `time.perf_counter()`. The
+vendored RLM reports into the process-wide registry (`get_metrics()`) when this
+package is importable:
+
+- rlm_root_call_seconds{model,depth}      root LM call latency
+- rlm_sub_call_seconds{model,depth}       sub-LLM call latency (cache misses)
+- rlm_code_exec_seconds{depth}            REPL code execution time
+- rlm_queue_wait_seconds{queue}           time spent waiting for a worker/lock
+- rlm_inflight{stage,depth}               calls currently in progress
+- rlm_tokens_total{model,depth,kind}      prompt/completion tokens
+- rlm_sub_cache_requests_total{result}    SubLLMCache hits and misses
+- rlm_exec_limit_total{limit}             executions stopped by ExecLimits
+- rlm_cascade_tier_seconds{model,outcome} sub-call cascade tier latency
+
+`depth` defaults to the calling thread's `depth_scope()`. Expose the registry
+with `serve_metrics()` (Prometheus text on /metrics) or `SnapshotWriter`
+(periodic JSON or Prometheus text file).
+"""
+
+from __future__ import annotations
+
+import bisect
+import contextvars
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0)
+
+# name -> (type, help, label names)
+CATALOG: Dict[str, Tuple[str, str, Tuple[str, ...]]] = {
+    "rlm_root_call_seconds": ("histogram", "Root LM call latency", ("model", "depth")),
+    "rlm_sub_call_seconds": ("histogram", "Sub-LLM call latency (cache misses)", ("model", "depth")),
+    "rlm_code_exec_seconds": ("histogram", "REPL code execution time", ("depth",)),
+    "rlm_queue_wait_seconds": ("histogram", "Time spent waiting for a worker or lock", ("queue",)),
+    "rlm_inflight": ("gauge", "Calls currently in progress", ("stage", "depth")),
+    "rlm_tokens_total": ("counter", "LLM tokens", ("model", "depth", "kind")),
+    "rlm_sub_cache_requests_total": ("counter", "SubLLMCache lookups", ("result",)),
+    "rlm_exec_limit_total": ("counter", "Executions stopped by ExecLimits", ("limit",)),
+    "rlm_cascade_tier_seconds": ("histogram", "Sub-call cascade tier latency by outcome", ("model", "outcome")),
+}
+
+_DEPTH: contextvars.ContextVar[int] = contextvars.ContextVar("rlm_depth", default=0)
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+
+class _Hist:
+    __slots__ = ("counts", "total", "count")
+
+    def __init__(self, n: int):
+        self.counts = [0] * (n + 1)  # last slot is +Inf
+        self.total = 0.0
+        self.count = 0
+
+
+class MetricsRegistry:
+    def __init__(self, buckets: Sequence[float] = LATENCY_BUCKETS):
+        self.buckets = tuple(buckets)
+        self._lock = threading.Lock()
+        self._hists: Dict[str, Dict[LabelKey, _Hist]] = {}
+        self._values: Dict[str, Dict[LabelKey, float]] = {}
+
+    def _key(self, name: str, labels: Dict[str, Any]) -> LabelKey:
+        names = CATALOG[name][2] if name in CATALOG else tuple(sorted(labels))
+        if "depth" in names and labels.get("depth") is None:
+            labels["depth"] = _DEPTH.get()
+        return tuple((n, str(labels.get(n, ""))) for n in names)
+
+    def observe(self, name: str, value: float, **labels: Any) -> None:
+        key = self._key(name, labels)
+        i = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            h = self._hists.setdefault(name, {}).get(key)
+            if h is None:
+                h = self._hists[name][key] = _Hist(len(self.buckets))
+            h.counts[i] += 1
+            h.total += value
+            h.count += 1
+
+    def inc(self, name: str, amount: float = 1, **labels: Any) -> None:
+        key = self._key(name, labels)
+        with self._lock:
+            series = self._values.setdefault(name, {})
+            series[key] = series.get(key, 0) + amount
+
+    def dec(self, name: str, amount: float = 1, **labels: Any) -> None:
+        self.inc(name, -amount, **labels)
+
+    @contextmanager
+    def track(self, name: str, stage: Optional[str] = None, **labels: Any) -> Iterator[None]:
+        """
+        Time the block into histogram `name`; with `stage`, also count it in rlm_inflight.
+        An explicit `depth` label becomes the thread's default depth inside the block.
+        """
+        depth = labels.get("depth")
+        token = _DEPTH.set(int(depth)) if depth is not None else None
+        if stage is not None:
+            self.inc("rlm_inflight", stage=stage, depth=depth)
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - t0, **labels)
+            if stage is not None:
+                self.dec("rlm_inflight", stage=stage, depth=depth)
+            if token is not None:
+                _DEPTH.reset(token)
+
+    @contextmanager
+    def depth_scope(self, depth: int) -> Iterator[None]:
+        """Default `depth` label for metrics recorded by this thread inside the block."""
+        token = _DEPTH.set(int(depth))
+        try:
+            yield
+        finally:
+            _DEPTH.reset(token)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._hists.clear()
+            self._values.clear()
+
+    # ---- exposition ----
+
+    def render_prometheus(self) -> str:
+        with self._lock:
+            hists = {n: {k: (list(h.counts), h.total, h.count) for k, h in s.items()} for n, s in self._hists.items()}
+            values = {n: dict(s) for n, s in self._values.items()}
+        lines: List[str] = []
+        for name in sorted(set(hists) | set(values)):
+            kind, help_text, _ = CATALOG.get(name, ("histogram" if name in hists else "gauge", name, ()))
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            if name in hists:
+                for key, (counts, total, count) in sorted(hists[name].items()):
+                    cum = 0
+                    for le, c in zip(self.buckets + (float("inf"),), counts):
+                        cum += c
+                        le_s = "+Inf" if le == float("inf") else repr(le)
+                        lines.append(f"{name}_bucket{_fmt_labels(key + (('le', le_s),))} {cum}")
+                    lines.append(f"{name}_sum{_fmt_labels(key)} {total}")
+                    lines.append(f"{name}_count{_fmt_labels(key)} {count}")
+            else:
+                for key, v in sorted(values[name].items()):
+                    lines.append(f"{name}{_fmt_labels(key)} {_fmt_num(v)}")
+        return "\n".join(lines) + "\n"
+
+    def snapshot(self) -> Dict[str, Any]:
+        """JSON-friendly view: per-series counts/sums/quantile estimates, counters, derived rates."""
+        with self._lock:
+            hists = {n: {k: (list(h.counts), h.total, h.count) for k, h in s.items()} for n, s in self._hists.items()}
+            values = {n: dict(s) for n, s in self._values.items()}
+        out: Dict[str, Any] = {"t": time.time(), "histograms": {}, "values": {}}
+        for name, series in hists.items():
+            out["histograms"][name] = [
+                dict(
+                    labels=dict(key),
+                    count=count,
+                    sum=round(total, 6),
+                    mean=round(total / count, 6) if count else 0.0,
+                    p50=_quantile(self.buckets, counts, 0.5),
+                    p95=_quantile(self.buckets, counts, 0.95),
+                )
+                for key, (counts, total, count) in sorted(series.items())
+            ]
+        for name, series in values.items():
+            out["values"][name] = [dict(labels=dict(k), value=v) for k, v in sorted(series.items())]
+        cache = {dict(k).get("result"): v for k, v in values.get("rlm_sub_cache_requests_total", {}).items()}
+        lookups = cache.get("hit", 0) + cache.get("miss", 0)
+        out["sub_cache_hit_rate"] = round(cache.get("hit", 0) / lookups, 4) if lookups else None
+        return out
+
+
+def _fmt_labels(key: LabelKey) -> str:
+    if not key:
+        return ""
+    esc = lambda v: v.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+    return "{" + ",".join(f'{n}="{esc(v)}"' for n, v in key) + "}"
+
+
+def _fmt_num(v: float) -> str:
+    return str(int(v)) if float(v).is_integer() else repr(float(v))
+
+
+def _quantile(buckets: Sequence[float], counts: Sequence[int], q: float) -> Optional[float]:
+    """Linear interpolation inside the bucket holding the q-th observation (Prometheus-style)."""
+    total = sum(counts)
+    if not total:
+        return None
+    rank, cum = q * total, 0
+    for i, c in enumerate(counts):
+        if cum + c >= rank and c:
+            lo = buckets[i - 1] if i > 0 else 0.0
+            if i >= len(buckets):
+                return buckets[-1]
+            return round(lo + (buckets[i] - lo) * (rank - cum) / c, 6)
+        cum += c
+    return buckets[-1]
+
+
+_REGISTRY = MetricsRegistry()
+
+
+def get_metrics() -> MetricsRegistry:
+    return _REGISTRY
+
+
+def serve_metrics(port: int = 9464, host: str = "127.0.0.1", registry: Optional[MetricsRegistry] = None):
+    """Serve Prometheus text on http://host:port/metrics from a daemon thread; returns the server."""
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    reg = registry or get_metrics()
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self) -> None:
+            if self.path.split("?")[0] not in ("/metrics", "/"):
+                self.send_error(404)
+                return
+            body = reg.render_prometheus().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args: Any) -> None:
+            pass
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="rlm-metrics-http", daemon=True).start()
+    return server
+
+
+class SnapshotWriter:
+    """Rewrite `path` every `interval_s` (atomically) with a JSON snapshot, or Prometheus text for *.prom."""
+
+    def __init__(self, path: str, interval_s: float = 5.0, registry: Optional[MetricsRegistry] = None):
+        self.path = path
+        self.interval_s = interval_s
+        self.registry = registry or get_metrics()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def write(self) -> None:
+        d = os.path.dirname(self.path)
+        if d:
+            os.makedirs(d, exist_ok=True)
+        if self.path.endswith(".prom"):
+            text = self.registry.render_prometheus()
+        else:
+            text = json.dumps(self.registry.snapshot(), indent=2)
+        tmp = f"{self.path}.tmp"
+        with open(tmp, "w") as f:
+            f.write(text)
+        os.replace(tmp, self.path)
+
+    def start(self) -> "SnapshotWriter":
+        def _loop() -> None:
+            while not self._stop.wait(self.interval_s):
+                try:
+                    self.write()
+                except OSError:
+                    pass
+
+        self._thread = threading.Thread(target=_loop, name="rlm-metrics-snapshot", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Stop the loop and write a final snapshot."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        self.write()
+
+
+def add_metrics_args(ap) -> None:
+    """Register --metrics-port/--metrics-file/--metrics-interval on an argparse parser."""
+    ap.add_argument("--metrics-port", type=int, default=None, help="serve Prometheus metrics on this port (/metrics)")
+    ap.add_argument("--metrics-file", default=None, help="periodically write a metrics snapshot here (.json, or .prom for Prometheus text)")
+    ap.add_argument("--metrics-interval", type=float, default=5.0, help="seconds between metrics snapshots")
+
+
+def start_exporters(args) -> Callable[[], None]:
+    """Start the exporters requested by add_metrics_args flags; returns a stop() callback."""
+    server = writer = None
+    if args.metrics_port is not None:
+        server = serve_metrics(args.metrics_port)
+        print(f"Serving metrics on http://127.0.0.1:{server.server_address[1]}/metrics")
+    if args.metrics_file:
+        writer = SnapshotWriter(args.metrics_file, args.metrics_interval).start()
+
+    def stop() -> None:
+        if writer is not None:
+            writer.stop()
+        if server is not None:
+            server.shutdown()
+
+    return stop
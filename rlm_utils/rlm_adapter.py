@@ -1,33 +1,60 @@
 from __future__ import annotations
 
 import os
-from typing import Any
+from typing import Any, Optional, Sequence
 
 from .pathing import bootstrap_paths
 
 
-def monkey_patch_litellm() -> None:
-    """Patch the vendored RLM to use our LiteLLM client for both root + sub calls."""
-    bootstrap_paths()
-    # Import after path bootstrap
-    from rlm.utils.litellm_client import LiteLLMClient  # type: ignore
-    import rlm.utils.llm as llm_mod  # type: ignore
-    import rlm.rlm_repl as rlm_repl_mod  # type: ignore
-
-    llm_mod.OpenAIClient = LiteLLMClient  # type: ignore[attr-defined]
-    rlm_repl_mod.OpenAIClient = LiteLLMClient  # type: ignore[attr-defined]
+def use_litellm() -> None:
+    """Route the vendored RLM's root + sub calls through our LiteLLM client.
 
-
-def build_rlm(model: str, max_iterations: int = 6, enable_logging: bool = True, *, max_depth: int = 1) -> Any:
-    """Return an RLM_REPL instance with our chosen model and settings."""
+    Only selects the provider in the lazy client registry; litellm itself is
+    imported when the first client is built.
+    """
+    bootstrap_paths()
+    from rlm.utils.clients import set_default_provider  # type: ignore
+
+    set_default_provider("litellm")
+
+
+# Backwards-compatible name from when this patched `OpenAIClient` in place
+monkey_patch_litellm = use_litellm
+
+
+def build_rlm(
+    model: str,
+    max_iterations: int = 6,
+    enable_logging: bool = True,
+    *,
+    max_depth: int = 1,
+    recursive_model: Optional[str] = None,
+    exec_limits: Optional[Any] = None,
+    async_logging: bool = False,
+    cascade_models: Optional[Sequence[str]] = None,
+    sub_parallelism: int = 8,
+    max_chunk_chars: Optional[int] = None,
+) -> Any:
+    """Return an RLM_REPL instance with our chosen model and settings (sub-calls default to `model`).
+
+    `exec_limits` is an `rlm.repl.ExecLimits` capping each REPL code execution;
+    `async_logging` renders console logs on a background thread; `cascade_models`
+    are cheaper sub-call models tried before `recursive_model` (see rlm.utils.cascade);
+    `sub_parallelism` and `max_chunk_chars` are the REPL's default fan-out and chunk cap.
+    """
     bootstrap_paths()
     from rlm.rlm_repl import RLM_REPL  # type: ignore
 
     return RLM_REPL(
         model=model,
-        recursive_model=model,
+        recursive_model=recursive_model or model,
         enable_logging=enable_logging,
         max_iterations=max_iterations,
         depth=0,
         max_depth=max_depth,
+        exec_limits=exec_limits,
+        async_logging=async_logging,
+        cascade_models=list(cascade_models or []),
+        sub_parallelism=sub_parallelism,
+        max_chunk_chars=max_chunk_chars,
     )
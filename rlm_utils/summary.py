@@ -44,6 +44,27 @@ def build_summary(events: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
     return rows
 
 
+def run_totals(events: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Whole-run counters (calls, tokens, iterations) from one run's events."""
+    usage = [e for e in events if e.get("kind") == "llm_usage"]
+    root_calls = sum(1 for e in events if e.get("kind") == "root_llm_call")
+    sub_calls = sum(1 for e in events if e.get("kind") == "sub_llm_call")
+    iterations = {int(e.get("iteration") or 0) for e in events if e.get("kind") == "root_llm_call"}
+    prompt_tokens = sum(int(e.get("prompt_tokens", 0) or 0) for e in usage)
+    completion_tokens = sum(int(e.get("completion_tokens", 0) or 0) for e in usage)
+    return dict(
+        iterations=len(iterations),
+        root_calls=root_calls,
+        sub_calls=sub_calls,
+        code_exec=sum(1 for e in events if e.get("kind") == "code_exec"),
+        # Client-level usage events also cover nested RLM calls; fall back to controller events
+        llm_calls=len(usage) if usage else root_calls + sub_calls,
+        prompt_tokens=prompt_tokens,
+        completion_tokens=completion_tokens,
+        total_tokens=prompt_tokens + completion_tokens,
+    )
+
+
 def print_summary(events: List[Dict[str, Any]], *, show_samples: bool = True) -> None:
     try:
         from rich.table import Table
@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import os
 import sys
+import threading
 import time
 from dataclasses import dataclass, field
 from typing import Dict, List, Optional, Tuple
@@ -16,6 +17,7 @@ class CallRecord:
     children: List["CallRecord"] = field(default_factory=list)
     duration: float = 0.0
     count: int = 1
+    tid: int = 0
 
 
 def _func_name(frame) -> str:
@@ -45,6 +47,7 @@ def run_with_trace(fn, *args, **kwargs):
     stack: List[CallRecord] = []
     roots: List[CallRecord] = []
     edges: Dict[Tuple[str, str], Tuple[int, float]] = {}
+    tid = threading.get_native_id()  # the profiler only sees this thread
 
     def tracer(frame, event, arg):
         if event not in ("call", "return"):
@@ -56,7 +59,7 @@ def run_with_trace(fn, *args, **kwargs):
         now = time.perf_counter()
         if event == "call":
             rec = CallRecord(
-                func=_func_name(frame), file=filename, line=frame.f_code.co_firstlineno, started_at=now
+                func=_func_name(frame), file=filename, line=frame.f_code.co_firstlineno, started_at=now, tid=tid
             )
             if stack:
                 stack[-1].children.append(rec)
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Benchmark CLI import time in fresh interpreters.
+
+Runs the import statement `--runs` times in new `python` processes and reports the
+median wall time above a bare interpreter start, plus the heaviest modules from
+`-X importtime`. Heavy optional dependencies must stay lazy: `--forbid` fails the run
+if any of them is imported, `--max-ms` if the median overhead exceeds the budget.
+
+Usage:
+  python scripts/bench_import.py
+  python scripts/bench_import.py --runs 9 --max-ms 150 --forbid openai,litellm,rich
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+from typing import Dict, List, Tuple
+
+_REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+DEFAULT_STMT = (
+    "import rlm_cli.run, rlm_cli.seq, rlm_cli.trace, rlm_cli.evaluate\n"
+    "from rlm_utils.pathing import bootstrap_paths\n"
+    "bootstrap_paths()\n"
+    "import rlm.rlm_repl\n"
+)
+
+
+def _run(code: str, *extra: str) -> Tuple[float, str]:
+    t0 = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, *extra, "-c", code],
+        cwd=_REPO_ROOT,
+        capture_output=True,
+        text=True,
+    )
+    wall = time.perf_counter() - t0
+    if proc.returncode != 0:
+        raise SystemExit(f"Import failed:\n{proc.stderr}")
+    return wall, proc.stderr
+
+
+def median_ms(code: str, runs: int) -> float:
+    return statistics.median(_run(code)[0] for _ in range(runs)) * 1000
+
+
+def importtime(code: str) -> Dict[str, int]:
+    """Cumulative microseconds per top-level-imported module, from `-X importtime`."""
+    _, err = _run(code, "-X", "importtime")
+    cumulative: Dict[str, int] = {}
+    for line in err.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        parts = line[len("import time:"):].split("|")
+        if len(parts) != 3 or not parts[1].strip().isdigit():
+            continue
+        name = parts[2][1:]  # drop the separator's space; nested imports stay indented
+        if name and not name.startswith(" "):
+            cumulative[name] = int(parts[1])
+    return cumulative
+
+
+def loaded_modules(code: str, names: List[str]) -> List[str]:
+    probe = code + f"\nimport sys\nprint(','.join(m for m in {names!r} if m in sys.modules))"
+    proc = subprocess.run([sys.executable, "-c", probe], cwd=_REPO_ROOT, capture_output=True, text=True)
+    out = proc.stdout.strip().splitlines()
+    return [m for m in (out[-1].split(",") if out else []) if m]
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--stmt", default=DEFAULT_STMT, help="code to time (default: import the CLIs + rlm.rlm_repl)")
+    ap.add_argument("--runs", type=int, default=5)
+    ap.add_argument("--top", type=int, default=10, help="show the N heaviest modules")
+    ap.add_argument("--max-ms", type=float, default=None, help="fail if the median import overhead exceeds this")
+    ap.add_argument("--forbid", default="openai,litellm,rich", help="comma-separated modules that must not be imported")
+    args = ap.parse_args()
+
+    base = median_ms("pass", args.runs)
+    total = median_ms(args.stmt, args.runs)
+    overhead = max(0.0, total - base)
+    print(f"interpreter start: {base:.1f} ms | with imports: {total:.1f} ms | import overhead: {overhead:.1f} ms (median of {args.runs})")
+
+    heaviest = sorted(importtime(args.stmt).items(), key=lambda kv: -kv[1])[: args.top]
+    print("\nheaviest imports (cumulative):")
+    for name, us in heaviest:
+        print(f"  {us / 1000:8.1f} ms  {name}")
+
+    failed = False
+    forbidden = [m for m in args.forbid.split(",") if m]
+    if forbidden:
+        eager = loaded_modules(args.stmt, forbidden)
+        if eager:
+            print(f"\nFAIL: imported eagerly: {', '.join(eager)}")
+            failed = True
+    if args.max_ms is not None and overhead > args.max_ms:
+        print(f"\nFAIL: import overhead {overhead:.1f} ms exceeds budget {args.max_ms:.1f} ms")
+        failed = True
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
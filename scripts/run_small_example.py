@@ -4,7 +4,7 @@ Run RLM_REPL on a tiny sampled context using LiteLLM.
 
 This script:
 - Samples a few small files from `data/` (first N bytes each)
-- Monkey‑patches the upstream client to use LiteLLM
+- Selects the LiteLLM client in the vendored RLM's lazy client registry
 - Runs the controller with a short iteration budget
 
 Setup (choose one provider and set its env var):
@@ -27,7 +27,7 @@ if _REPO_ROOT not in sys.path:
 
 from rlm_utils.env import apply_proxy_env, effective_model  # type: ignore
 from rlm_utils.pathing import bootstrap_paths  # type: ignore
-from rlm_utils.rlm_adapter import monkey_patch_litellm, build_rlm  # type: ignore
+from rlm_utils.rlm_adapter import use_litellm, build_rlm  # type: ignore
 from rlm_utils.sampling import small_sample_from_dir, small_sample_from_file  # type: ignore
 
 
@@ -57,7 +57,7 @@ def main() -> None:
 
     # Import upstream modules
     bootstrap_paths()
-    monkey_patch_litellm()
+    use_litellm()
     apply_proxy_env(args.api_base)
 
     # Model selection (neutral alias works with LiteLLM proxy)
@@ -17,7 +17,7 @@ if _REPO_ROOT not in sys.path:
 
 from rlm_utils.env import apply_proxy_env, effective_model  # type: ignore
 from rlm_utils.pathing import bootstrap_paths  # type: ignore
-from rlm_utils.rlm_adapter import monkey_patch_litellm, build_rlm  # type: ignore
+from rlm_utils.rlm_adapter import use_litellm, build_rlm  # type: ignore
 from rlm_utils.sampling import small_sample_from_dir, small_sample_from_file  # type: ignore
 from rlm_utils.tracing import run_with_trace, render_cli_tree, export_mermaid  # type: ignore
 
@@ -43,7 +43,7 @@ def main() -> None:
 
     # Env + model
     bootstrap_paths()
-    monkey_patch_litellm()
+    use_litellm()
     apply_proxy_env(args.api_base)
     model = effective_model("gemini-2.5-flash-lite")
     rlm = build_rlm(model, max_iterations=args.max_iters, enable_logging=False)
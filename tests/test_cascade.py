@@ -0,0 +1,130 @@
+import os
+import sys
+import unittest
+
+
+_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, os.path.join(_ROOT, "vendor", "rlm"))
+sys.path.insert(0, _ROOT)
+
+from rlm.utils.cascade import CascadeStats, CascadeSubRLM, check_answer  # noqa: E402
+
+
+class TierClient:
+    """Offline client whose answers are scripted per model name."""
+
+    answers = {}
+    calls = []
+
+    def __init__(self, api_key=None, model="cheap"):
+        self.model = model
+
+    def completion(self, messages, max_tokens=None, **kwargs):
+        TierClient.calls.append(self.model)
+        answer = TierClient.answers[self.model]
+        if isinstance(answer, Exception):
+            raise answer
+        return answer
+
+
+class TestCheckAnswer(unittest.TestCase):
+    def test_reasons(self):
+        self.assertEqual(check_answer("  "), "empty")
+        self.assertEqual(check_answer(None), "empty")
+        self.assertEqual(check_answer("Error making LLM query: timeout"), "error")
+        self.assertEqual(check_answer("I don't know."), "unsure")
+        self.assertEqual(check_answer("```python\nx = 1"), "malformed")
+        self.assertEqual(check_answer("name: a", "Reply in JSON"), "malformed")
+        self.assertIsNone(check_answer('```json\n{"name": "a"}\n```', [{"role": "user", "content": "Reply in JSON"}]))
+        self.assertIsNone(check_answer("The magic number is 42."))
+        self.assertEqual(check_answer("Here:\n```python\nx = 1\n"), "malformed")
+        # Inline backticks are not an unclosed code block
+        self.assertIsNone(check_answer("Wrap code in ``` fences."))
+        # Long answers that mention missing information are still accepted
+        self.assertIsNone(check_answer("Section 3 has not enough information on costs. " + "Detail. " * 40))
+
+    def test_json_only_required_by_the_instruction(self):
+        doc = 'The Federalist is stored as JSON: {"no": 51}.'
+        prompt = [{"role": "user", "content": f"Who wrote this paper?\n\n<CONTEXT>\n{doc}\n</CONTEXT>"}]
+        self.assertIsNone(check_answer("Hamilton wrote it.", prompt))
+        ask_json = [{"role": "user", "content": f"Return JSON with an author key.\n\n<CONTEXT>\n{doc}\n</CONTEXT>"}]
+        self.assertEqual(check_answer("Hamilton wrote it.", ask_json), "malformed")
+        self.assertIsNone(check_answer('{"author": "Hamilton"}', ask_json))
+
+    def test_mentioning_json_is_not_asking_for_it(self):
+        for instruction in (
+            "Do not answer in JSON, just name the author.",
+            "The field is called json_id; which paper has json_id 51?",
+            "Return plain text, not JSON.",
+            "Write the author's name; the results go to out.json later.",
+        ):
+            self.assertIsNone(check_answer("Hamilton wrote it.", instruction), instruction)
+        self.assertEqual(check_answer("Hamilton wrote it.", "Output the result as valid JSON."), "malformed")
+        # The caller can say outright whether JSON is expected
+        self.assertEqual(check_answer("Hamilton", "Who wrote it? Keys: author.", expect_json=True), "malformed")
+        self.assertIsNone(check_answer("Hamilton", "Reply in JSON", expect_json=False))
+
+
+class TestCascadeSubRLM(unittest.TestCase):
+    def setUp(self):
+        from rlm.utils import clients
+
+        self.clients = clients
+        clients.register_client("tiers", TierClient)
+        clients.set_default_provider("tiers")
+        TierClient.calls = []
+
+    def tearDown(self):
+        self.clients.set_default_provider(None)
+
+    def test_cheap_answer_is_kept(self):
+        TierClient.answers = {"cheap": "42", "strong": "forty-two"}
+        sub = CascadeSubRLM(["cheap", "strong"], api_key="k")
+        self.assertEqual(sub.completion("What is it?"), "42")
+        self.assertEqual(TierClient.calls, ["cheap"])
+        self.assertEqual(sub.model, "cheap")
+
+    def test_escalates_on_failed_validation_and_errors(self):
+        stats = CascadeStats()
+        TierClient.answers = {"cheap": "I'm not sure.", "mid": RuntimeError("boom"), "strong": "42"}
+        sub = CascadeSubRLM(["cheap", "mid", "strong"], api_key="k", stats=stats)
+        self.assertEqual(sub.completion("What is it?"), "42")
+        self.assertEqual(TierClient.calls, ["cheap", "mid", "strong"])
+        summary = {t["model"]: t for t in stats.summary()}
+        self.assertEqual(summary["cheap"]["reasons"], {"unsure": 1})
+        self.assertEqual(summary["mid"]["reasons"], {"error": 1})
+        self.assertEqual((summary["strong"]["calls"], summary["strong"]["accepted"]), (1, 1))
+
+    def test_explicit_escalation_skips_cheap_tiers(self):
+        TierClient.answers = {"cheap": "42", "strong": "forty-two"}
+        sub = CascadeSubRLM(["cheap", "strong"], api_key="k")
+        self.assertEqual(sub.completion("What is it?", escalate=True), "forty-two")
+        self.assertEqual(TierClient.calls, ["strong"])
+
+    def test_repl_helpers_route_through_cascade(self):
+        import rlm.repl as repl_mod
+
+        TierClient.answers = {"cheap": "cheap answer", "strong": "strong answer"}
+        stats = CascadeStats()
+        env = repl_mod.REPLEnv(
+            recursive_model="strong",
+            sub_rlm_factory=lambda: CascadeSubRLM(["cheap", "strong"], api_key="k", stats=stats),
+            sub_cache=repl_mod.SubLLMCache(),
+        )
+        env.code_execution(
+            "a = llm_query('q')\n"
+            "b = llm_query('q', escalate=True)\n"
+            "c = llm_query_text('t', 'Summarize', escalate=True)\n"
+            "d = llm_map_reduce(['x', 'y'], 'Echo')"
+        )
+        self.assertEqual((env.locals["a"], env.locals["b"], env.locals["c"]), ("cheap answer", "strong answer", "strong answer"))
+        self.assertEqual(env.locals["d"], "cheap answer")
+        calls = {t["model"]: t["calls"] for t in stats.summary()}
+        # a + 2 maps + 1 reduce on the cheap tier; b and c escalated (cached apart from a)
+        self.assertEqual(calls, {"cheap": 4, "strong": 2})
+        # Forks and map workers share the thread-safe cascade instead of building new ones
+        self.assertIs(env.fork().sub_rlm, env.sub_rlm)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,103 @@
+import json
+import os
+import sys
+import tempfile
+import unittest
+
+
+_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, os.path.join(_ROOT, "vendor", "rlm"))
+sys.path.insert(0, _ROOT)
+
+from rlm_utils.chrome_trace import ChromeTraceWriter, export_chrome_trace, trace_event  # noqa: E402
+from rlm_utils.event_log import EventLogger, scoped_logger  # noqa: E402
+
+
+class TestSpans(unittest.TestCase):
+    def test_spans_nest_and_carry_sessions(self):
+        log = EventLogger()
+        with log.span("outer", new_session=True, depth=0):
+            log.add("code_exec", iteration=1)
+            with log.span("inner", new_session=True, depth=1):
+                pass
+        begins = [e for e in log.events if e.kind == "span" and e.data["ph"] == "B"]
+        outer, inner = begins
+        self.assertIsNone(outer.data["parent_session"])
+        self.assertEqual(inner.data["parent_session"], outer.data["session"])
+        self.assertNotEqual(inner.data["session"], outer.data["session"])
+        self.assertEqual([e.data.get("ph") for e in log.events], ["B", None, "B", "E", "E"])
+
+        trace = [trace_event(e) for e in log.events]
+        self.assertEqual(trace[0]["name"], "outer")
+        self.assertEqual(trace[0]["args"]["depth"], 0)
+        self.assertEqual((trace[1]["ph"], trace[1]["name"]), ("i", "code_exec"))
+        self.assertEqual({t["tid"] for t in trace}, {log.events[0].tid})
+        # dump() dicts convert the same way
+        self.assertEqual([trace_event(d) for d in log.dump()], trace)
+
+
+class TestChromeTraceWriter(unittest.TestCase):
+    def test_streams_valid_json_before_and_after_close(self):
+        with tempfile.TemporaryDirectory() as d:
+            path = os.path.join(d, "trace.json")
+            writer = ChromeTraceWriter(path, flush_s=0).start()
+            with scoped_logger() as log:
+                with log.span("work", depth=0):
+                    log.add("llm_usage", prompt_tokens=3)
+            # Readable mid-run: only the closing bracket is missing
+            with open(path) as f:
+                partial = json.loads(f.read() + "]")
+            writer.close()
+            log.add("after_close")
+            with open(path) as f:
+                events = json.load(f)
+        self.assertEqual(events, partial)
+        self.assertEqual([e["ph"] for e in events], ["M", "B", "i", "E"])
+        self.assertTrue(all(isinstance(e["ts"], float) for e in events[1:]))
+
+    def test_export_includes_traced_calls(self):
+        from rlm.utils.utils import parse_response
+        from rlm_utils.tracing import run_with_trace
+
+        def work():
+            log.add("marker")
+            return parse_response("FINAL(1)")
+
+        log = EventLogger()
+        _, roots, _ = run_with_trace(work)
+        with tempfile.TemporaryDirectory() as d:
+            path = os.path.join(d, "trace.json")
+            export_chrome_trace(log.events, path, call_records=roots)
+            with open(path) as f:
+                events = json.load(f)
+        self.assertIn("i", [e["ph"] for e in events])
+        calls = [e for e in events if e["ph"] == "X"]
+        self.assertIn("parse_response", [e["name"] for e in calls])
+        self.assertTrue(all(e["dur"] >= 0 for e in calls))
+
+
+class TestREPLSpans(unittest.TestCase):
+    def test_exec_and_sub_calls_are_spans(self):
+        import rlm.repl as repl_mod
+        from test_repl_env import DummySubRLM
+
+        repl_mod.Sub_RLM = DummySubRLM
+        env = repl_mod.REPLEnv(recursive_model="dummy", depth=1)
+        with scoped_logger() as log:
+            with log.span("rlm.completion", new_session=True):
+                env.code_execution("x = llm_map_reduce(['a', 'b', 'c'], 'Echo')")
+        begins = [e for e in log.events if e.kind == "span" and e.data["ph"] == "B"]
+        names = [e.data["name"] for e in begins]
+        self.assertIn("repl.exec", names)
+        self.assertIn("map_reduce.reduce", names)
+        subs = [e for e in begins if e.data["name"] == "sub_llm"]
+        self.assertEqual(len(subs), 4)  # 3 maps + 1 reduce
+        self.assertEqual({e.data["depth"] for e in subs}, {2})
+        # Worker-thread spans stay in the caller's session
+        self.assertEqual({e.data["session"] for e in subs}, {begins[0].data["session"]})
+        ends = sum(1 for e in log.events if e.kind == "span" and e.data["ph"] == "E")
+        self.assertEqual(ends, len(begins))
+
+
+if __name__ == "__main__":
+    unittest.main()
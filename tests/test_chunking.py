@@ -0,0 +1,177 @@
+import os
+import sys
+import unittest
+
+
+_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, os.path.join(_ROOT, "vendor", "rlm"))
+
+
+def _papers(n: int, body_lines: int = 400) -> str:
+    body = "\n".join(f"line {i} of the argument for union" for i in range(body_lines))
+    return "".join(f"THE FEDERALIST.\nNo. {i}.\n\n{body}\n\n" for i in range(n))
+
+
+class TestChunkPlanner(unittest.TestCase):
+    def setUp(self):
+        from rlm.utils import chunking
+        from rlm.utils.llm_stats import get_stats
+
+        self.chunking = chunking
+        get_stats().reset()
+
+    def test_chunks_cover_text_fit_window_and_align_to_headers(self):
+        text = _papers(40)
+        plan = self.chunking.plan_chunks(text, model="gpt-4o", max_chunk_chars=100_000, parallelism=4)
+        self.assertEqual(plan.bounds[0][0], 0)
+        self.assertEqual(plan.bounds[-1][1], len(text))
+        for (s, e), (s2, _) in zip(plan.bounds, plan.bounds[1:]):
+            self.assertEqual(e, s2)
+        for s, e in plan:
+            self.assertLessEqual(e - s, 100_000)
+            self.assertTrue(text[s:].startswith("THE FEDERALIST."))
+        # Chunk count fills whole rounds of the given parallelism
+        self.assertEqual(len(plan) % 4, 0)
+
+    def test_small_text_stays_one_call(self):
+        plan = self.chunking.plan_chunks("short context\n" * 100, model="gemini/gemini-2.5-flash-lite")
+        self.assertEqual(plan.bounds, [(0, 1400)])
+
+    def test_list_items_are_packed_by_index(self):
+        docs = ["x" * 30_000] * 10
+        plan = self.chunking.plan_chunks(docs, max_chunk_chars=100_000, parallelism=2)
+        self.assertEqual(plan.bounds[0][0], 0)
+        self.assertEqual(plan.bounds[-1][1], 10)
+        for s, e in plan:
+            self.assertLessEqual(sum(len(d) for d in docs[s:e]), 100_000)
+
+    def test_model_spec_prefix_match(self):
+        self.assertIs(self.chunking.model_spec("openai/gpt-5-mini-2025"), self.chunking.MODEL_SPECS["gpt-5-mini"])
+        self.assertIs(self.chunking.model_spec("unknown"), self.chunking.DEFAULT_SPEC)
+
+    def test_live_latency_overrides_defaults(self):
+        from rlm.utils.llm_stats import get_stats
+
+        for tokens in (1_000, 10_000, 50_000):
+            get_stats().record("m", tokens, 0.5 + tokens / 10_000)
+        base, tok_per_s = get_stats().latency_model("m")
+        self.assertAlmostEqual(base, 0.5, places=6)
+        self.assertAlmostEqual(tok_per_s, 10_000, places=3)
+        plan = self.chunking.plan_chunks("a\n" * 50_000, model="m")
+        self.assertEqual(plan.latency_source, "live")
+
+
+class TestReduceGroups(unittest.TestCase):
+    def test_groups_fill_budget_and_always_shrink(self):
+        from rlm.utils.chunking import reduce_groups
+
+        # A lone leftover is carried to the next round instead of overfilling a group
+        self.assertEqual(reduce_groups([10] * 10, budget=35), [(0, 3), (3, 6), (6, 9), (9, 10)])
+        self.assertEqual(reduce_groups([150_000] * 3, budget=377_593), [(0, 2), (2, 3)])
+        self.assertEqual(reduce_groups([10] * 10, budget=1_000, fan_in=4), [(0, 4), (4, 8), (8, 10)])
+        # When no two neighbours fit, items are still paired so reduction terminates
+        self.assertEqual(reduce_groups([50] * 5, budget=10), [(0, 2), (2, 4), (4, 5)])
+        self.assertEqual(reduce_groups([5, 5], budget=100), [(0, 2)])
+
+    def test_groups_stay_within_budget_when_a_fitting_split_exists(self):
+        import random
+        from rlm.utils.chunking import reduce_groups
+
+        rng = random.Random(7)
+        for _ in range(500):
+            sizes = [rng.randint(1, 120) for _ in range(rng.randint(2, 12))]
+            budget = rng.randint(50, 200)
+            groups = reduce_groups(sizes, budget, fan_in=rng.choice([None, 2, 3]))
+            self.assertEqual([i for s, e in groups for i in range(s, e)], list(range(len(sizes))))
+            self.assertLess(len(groups), len(sizes))
+            if any(a + b <= budget for a, b in zip(sizes, sizes[1:])):
+                for s, e in groups:
+                    if e - s > 1:
+                        self.assertLessEqual(sum(sizes[s:e]), budget, (sizes, budget, groups))
+
+
+class TestPlanChunksHelper(unittest.TestCase):
+    def test_repl_exposes_plan_chunks(self):
+        import rlm.repl as repl_mod
+
+        class _Sub:
+            model = "gpt-4o"
+
+            def __init__(self, model="gpt-4o"):
+                pass
+
+        repl_mod.Sub_RLM = _Sub
+        env = repl_mod.REPLEnv(recursive_model="gpt-4o", context_str=_papers(5))
+        r = env.code_execution("p = plan_chunks(context, max_chunk_chars=20_000)\nprint(len(p), p.bounds[-1][1] == len(context))")
+        self.assertIn("True", r.stdout)
+        self.assertEqual(r.stderr, "")
+        # The env's max_chunk_chars is the default cap when the call gives none
+        capped = repl_mod.REPLEnv(recursive_model="gpt-4o", context_str=_papers(5), max_chunk_chars=20_000)
+        r = capped.code_execution("print(plan_chunks(context).max_chunk_chars <= 20_000)")
+        self.assertIn("True", r.stdout)
+
+
+class TestMapReduceHelper(unittest.TestCase):
+    def setUp(self):
+        import threading
+        import time
+        import rlm.repl as repl_mod
+
+        calls, active, peak = [], [0], [0]
+        lock = threading.Lock()
+
+        class _Sub:
+            model = "gpt-4o"
+
+            def __init__(self, model="gpt-4o"):
+                pass
+
+            def completion(self, prompt):
+                content = prompt[0]["content"]
+                with lock:
+                    calls.append(content)
+                    active[0] += 1
+                    peak[0] = max(peak[0], active[0])
+                time.sleep(0.01)
+                with lock:
+                    active[0] -= 1
+                if content.startswith("Count"):
+                    return "1"
+                # Reduce: add up the partial counts
+                parts = content.split("[Part ")[1:]
+                return str(sum(int(p.split("\n", 1)[1].split()[0]) for p in parts))
+
+        repl_mod.Sub_RLM = _Sub
+        self.calls, self.peak = calls, peak
+        self.env = repl_mod.REPLEnv(recursive_model="gpt-4o", context_str=_papers(5), sub_parallelism=4)
+
+    def test_parallel_map_then_tree_reduce(self):
+        r = self.env.code_execution(
+            "chunks = [f'doc {i}' for i in range(12)]\n"
+            "print(llm_map_reduce(chunks, 'Count the documents.', 'Merge:', fan_in=3))"
+        )
+        self.assertEqual(r.stderr, "")
+        # 12 maps, then 12 -> 4 (groups of 3) -> 2 (one merge of 3, one carried) -> 1
+        self.assertEqual(r.stdout.strip(), "12")
+        self.assertEqual(len(self.calls), 12 + 4 + 1 + 1)
+        self.assertGreater(self.peak[0], 1)
+
+    def test_intermediates_are_cached(self):
+        code = "out = llm_map_reduce([context[:100], context[100:200], context[200:300]], 'Count the documents.')"
+        self.env.code_execution(code)
+        first = len(self.calls)
+        self.env.code_execution(code)
+        self.assertEqual(len(self.calls), first)
+        self.assertEqual(self.env.locals["out"], "3")
+
+    def test_string_input_is_chunked_with_plan_chunks(self):
+        out = self.env.map_reduce(self.env.locals["context"], "Count the documents.", max_chunk_chars=20_000)
+        maps = [c for c in self.calls if c.startswith("Count")]
+        self.assertGreater(len(maps), 1)
+        # All partial results fit one reduce call
+        self.assertEqual(out, str(len(maps)))
+        self.assertEqual(len(self.calls), len(maps) + 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,90 @@
+import os
+import subprocess
+import sys
+import unittest
+from unittest import mock
+
+
+_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, os.path.join(_ROOT, "vendor", "rlm"))
+sys.path.insert(0, _ROOT)
+
+
+class FakeClient:
+    """Offline client: answers every root call with a FINAL(...) marker."""
+
+    instances = []
+
+    def __init__(self, api_key=None, model="fake"):
+        self.api_key = api_key
+        self.model = model
+        FakeClient.instances.append(self)
+
+    def completion(self, messages, max_tokens=None, **kwargs):
+        return "FINAL(forty-two)"
+
+
+class TestClientRegistry(unittest.TestCase):
+    def setUp(self):
+        from rlm.utils import clients
+
+        self.clients = clients
+        clients.register_client("fake", FakeClient)
+        clients.set_default_provider("fake")
+        FakeClient.instances = []
+
+    def tearDown(self):
+        self.clients.set_default_provider(None)
+
+    def test_make_client_uses_default_provider(self):
+        client = self.clients.make_client("k", "m")
+        self.assertIsInstance(client, FakeClient)
+        self.assertEqual((client.api_key, client.model), ("k", "m"))
+
+    def test_unknown_provider(self):
+        with self.assertRaises(KeyError):
+            self.clients.set_default_provider("nope")
+        with self.assertRaises(KeyError):
+            self.clients.get_client_class("nope")
+
+    def test_string_targets_import_on_first_use(self):
+        self.clients.register_client("lazy", "rlm.utils.llm_stats:LatencyStats")
+        from rlm.utils.llm_stats import LatencyStats
+
+        self.assertIs(self.clients.get_client_class("lazy"), LatencyStats)
+
+    def test_rlm_repl_runs_offline_with_registered_client(self):
+        from rlm.rlm_repl import RLM_REPL
+        from rlm.logger import NullLogger
+
+        with mock.patch.dict(os.environ, {"OPENAI_API_KEY": "test"}):
+            rlm = RLM_REPL(model="root", recursive_model="sub", max_iterations=2)
+            self.assertIsInstance(rlm.logger, NullLogger)
+            answer = rlm.completion(context="some context", query="What is the answer?")
+        self.assertEqual(answer, "forty-two")
+        self.assertEqual(FakeClient.instances[0].model, "root")
+
+    def test_use_litellm_selects_provider_without_importing_it(self):
+        from rlm_utils.rlm_adapter import use_litellm
+
+        use_litellm()
+        self.assertEqual(self.clients.default_provider(), "litellm")
+
+
+class TestLazyImports(unittest.TestCase):
+    def test_cli_imports_skip_heavy_dependencies(self):
+        code = (
+            "import sys\n"
+            "import rlm_cli.run, rlm_cli.seq, rlm_cli.trace, rlm_cli.evaluate\n"
+            "from rlm_utils.pathing import bootstrap_paths\n"
+            "bootstrap_paths()\n"
+            "import rlm.rlm_repl\n"
+            "print(sorted(m for m in ('openai', 'litellm', 'rich') if m in sys.modules))\n"
+        )
+        proc = subprocess.run([sys.executable, "-c", code], cwd=_ROOT, capture_output=True, text=True)
+        self.assertEqual(proc.returncode, 0, proc.stderr)
+        self.assertEqual(proc.stdout.strip(), "[]")
+
+
+if __name__ == "__main__":
+    unittest.main()
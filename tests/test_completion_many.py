@@ -0,0 +1,91 @@
+import os
+import sys
+import threading
+import unittest
+from unittest import mock
+
+
+_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, os.path.join(_ROOT, "vendor", "rlm"))
+sys.path.insert(0, _ROOT)
+
+import rlm.repl  # noqa: E402
+
+# Other test modules swap rlm.repl.Sub_RLM for an offline dummy; this test wants the
+# real one, talking to the registered fake provider
+_SUB_RLM = rlm.repl.Sub_RLM
+
+QUERIES = ["alpha?", "beta?", "gamma?", "delta?"]
+
+# Each root loop records whether it saw another query's variable, asks the same
+# sub-question as every other query, and answers through FINAL_VAR.
+ROOT_CODE = """```repl
+try:
+    leaked = mine
+except NameError:
+    leaked = None
+mine = {query!r}
+note = llm_query('Summarize: ' + context)
+answer = mine + '|' + str(leaked) + '|' + note
+```
+FINAL_VAR(answer)"""
+
+
+class ScriptedClient:
+    """Offline client: the root model writes ROOT_CODE for its query, the sub model echoes."""
+
+    barrier = None
+    calls = []
+    lock = threading.Lock()
+
+    def __init__(self, api_key=None, model="root"):
+        self.model = model
+
+    def completion(self, messages, max_tokens=None, **kwargs):
+        with ScriptedClient.lock:
+            ScriptedClient.calls.append(self.model)
+        if self.model != "root":
+            return "summary"
+        # Every query's first root call waits here, so they must all be in flight at once
+        ScriptedClient.barrier.wait(timeout=10)
+        last = messages[-1]["content"]
+        query = next(q for q in QUERIES if q in last)
+        return ROOT_CODE.format(query=query)
+
+
+class TestCompletionMany(unittest.TestCase):
+    def setUp(self):
+        from rlm.utils import clients
+
+        self.clients = clients
+        clients.register_client("scripted", ScriptedClient)
+        clients.set_default_provider("scripted")
+        ScriptedClient.calls = []
+        ScriptedClient.barrier = threading.Barrier(len(QUERIES))
+
+    def tearDown(self):
+        self.clients.set_default_provider(None)
+
+    def test_queries_run_concurrently_over_one_context(self):
+        from rlm.repl import REPLEnv
+        from rlm.rlm_repl import RLM_REPL
+
+        with mock.patch.dict(os.environ, {"OPENAI_API_KEY": "test"}):
+            rlm = RLM_REPL(model="root", recursive_model="sub", max_iterations=2)
+            with mock.patch("rlm.repl.Sub_RLM", _SUB_RLM), \
+                    mock.patch("rlm.rlm_repl.REPLEnv", wraps=REPLEnv) as env_cls:
+                results = list(rlm.completion_many("the document", QUERIES))
+
+        # One context load; every query answered exactly once, mapped back to its index
+        self.assertEqual(env_cls.call_count, 1)
+        self.assertEqual(sorted(i for i, _ in results), list(range(len(QUERIES))))
+        for i, answer in results:
+            # No session saw another session's `mine`
+            self.assertEqual(answer, f"{QUERIES[i]}|None|summary")
+        # The identical sub-call went to the model once, through the shared cache
+        self.assertEqual(ScriptedClient.calls.count("sub"), 1)
+        self.assertEqual(ScriptedClient.calls.count("root"), len(QUERIES))
+
+
+if __name__ == "__main__":
+    unittest.main()
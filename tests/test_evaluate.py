@@ -0,0 +1,115 @@
+import json
+import os
+import sys
+import tempfile
+import time
+import unittest
+
+
+_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, _ROOT)
+
+
+class FakeRLM:
+    """Answers with the context's last word after `max_iterations` logged root calls."""
+
+    def __init__(self, config):
+        self.config = config
+
+    def completion(self, context, query):
+        from rlm_utils.event_log import get_logger
+
+        for it in range(self.config["max_iterations"]):
+            get_logger().add("root_llm_call", iteration=it)
+            get_logger().add("llm_usage", model="fake", prompt_tokens=10, completion_tokens=5)
+            time.sleep(0.001)
+        if self.config["max_iterations"] < 2:
+            return "I don't know"
+        return f"The answer is {context.split()[-1]}."
+
+
+class TestEvaluate(unittest.TestCase):
+    def setUp(self):
+        from rlm_utils import evaluate
+
+        self.ev = evaluate
+
+    def test_score_modes(self):
+        self.assertEqual(self.ev.score_answer("The answer is 42.", "42", "contains"), 1.0)
+        self.assertEqual(self.ev.score_answer("42", "42!", "exact"), 1.0)
+        self.assertEqual(self.ev.score_answer("The answer is 42.", "42", "exact"), 0.0)
+        self.assertEqual(self.ev.score_answer("found 1 and 3", ["1", "2", "3"]), 2 / 3)
+        self.assertEqual(self.ev.score_answer("written by Alexander Hamiltn", "Alexander Hamilton", "fuzzy"), 1.0)
+        self.assertEqual(self.ev.score_answer(None, "x"), 0.0)
+
+    def test_pareto_and_target(self):
+        rows = [
+            dict(config_id="a", accuracy=1.0, wall_s=10.0, total_tokens=100, llm_calls=5),
+            dict(config_id="b", accuracy=1.0, wall_s=5.0, total_tokens=100, llm_calls=5),
+            dict(config_id="c", accuracy=0.5, wall_s=1.0, total_tokens=50, llm_calls=2),
+        ]
+        self.ev.mark_pareto(rows)
+        self.assertEqual([r["pareto"] for r in rows], [False, True, True])
+        self.assertEqual(self.ev.fastest_meeting(rows, 0.9)["config_id"], "b")
+        self.assertIsNone(self.ev.fastest_meeting(rows, 1.1))
+
+    def test_run_grid_attributes_events_per_run(self):
+        items = [
+            self.ev.EvalItem(id="one", query="q", expected="alpha", context="x y alpha"),
+            self.ev.EvalItem(id="two", query="q", expected="beta", context={"text": "beta"}),
+        ]
+        configs = self.ev.expand_grid({"max_iterations": [1, 3]})
+        results = self.ev.run_grid(items, configs, workers=4, rlm_factory=FakeRLM)
+        self.assertEqual(len(results), 4)
+        for r in results:
+            n = r.config["max_iterations"]
+            self.assertEqual(r.totals["root_calls"], n)
+            self.assertEqual(r.totals["total_tokens"], 15 * n)
+        rows = {r["config_id"]: r for r in self.ev.aggregate(results)}
+        self.assertEqual(rows["max_iterations=1"]["accuracy"], 0.0)
+        self.assertEqual(rows["max_iterations=3"]["accuracy"], 1.0)
+        self.assertTrue(rows["max_iterations=3"]["pareto"])
+
+    def test_unknown_grid_keys_are_rejected(self):
+        with self.assertRaises(ValueError) as cm:
+            self.ev.expand_grid({"max_iterations": [2], "chunk_size": [1000]})
+        self.assertIn("chunk_size", str(cm.exception))
+        # A custom rlm_factory may take its own keys
+        self.assertEqual(self.ev.expand_grid({"chunk_size": [1, 2]}, known=None), [{"chunk_size": 1}, {"chunk_size": 2}])
+
+    def test_default_factory_wires_chunk_and_limit_knobs(self):
+        from unittest import mock
+
+        config = self.ev.expand_grid({
+            "model": ["m"],
+            "max_chunk_chars": [20000],
+            "sub_parallelism": [2],
+            "exec_timeout": [5],
+            "exec_isolation": ["process"],
+        })[0]
+        with mock.patch("rlm_utils.rlm_adapter.build_rlm") as build:
+            self.ev.default_rlm_factory(config)
+        kwargs = build.call_args.kwargs
+        self.assertEqual((kwargs["max_chunk_chars"], kwargs["sub_parallelism"]), (20000, 2))
+        limits = kwargs["exec_limits"]
+        self.assertEqual((limits.wall_s, limits.cpu_s, limits.isolation), (5.0, None, "process"))
+        with mock.patch("rlm_utils.rlm_adapter.build_rlm") as build:
+            self.ev.default_rlm_factory({"model": "m"})
+        self.assertIsNone(build.call_args.kwargs["exec_limits"])
+
+    def test_cache_dir_is_under_the_repo(self):
+        self.assertEqual(self.ev.DEFAULT_CACHE_DIR, os.path.join(_ROOT, "artifacts", "eval_cache"))
+
+    def test_load_items_and_haystack_context(self):
+        tmp = tempfile.mkdtemp(prefix="eval_test_")
+        path = os.path.join(tmp, "items.jsonl")
+        with open(path, "w") as f:
+            f.write(json.dumps({"id": "h", "query": "q", "expected": "1", "context": {"haystack": {"num_lines": 50, "needles": ["777"], "seed": 1}}}) + "\n")
+        items = self.ev.load_items(path)
+        text = self.ev.resolve_context(items[0].context, cache_dir=tmp)
+        self.assertIn("The magic number is 777", text)
+        self.assertEqual(len(text.splitlines()), 50)
+
+
+if __name__ == "__main__":
+    unittest.main()
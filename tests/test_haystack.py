@@ -0,0 +1,89 @@
+import os
+import sys
+import tempfile
+import unittest
+
+
+_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, _ROOT)
+
+
+class TestHaystack(unittest.TestCase):
+    def setUp(self):
+        from rlm_utils import haystack
+
+        self.hs = haystack
+        self.tmp = tempfile.mkdtemp(prefix="haystack_test_")
+        self.path = os.path.join(self.tmp, "h.txt")
+
+    def tearDown(self):
+        import shutil
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def _read_lines(self):
+        with open(self.path, "rb") as f:
+            data = f.read()
+        return data, data.decode("utf-8").split("\n")
+
+    def test_needles_match_recorded_line_and_offset(self):
+        truth = self.hs.generate_haystack(self.path, 5000, needles=3, seed=7, chunk_lines=512)
+        data, lines = self._read_lines()
+        self.assertEqual(truth.num_bytes, len(data))
+        self.assertEqual(truth.num_lines, 5000)
+        self.assertEqual(data.count(b"\n"), truth.num_lines)
+        self.assertEqual(len(truth.needles), 3)
+        for nd, line in self.hs.iter_needle_lines(self.path, truth):
+            self.assertEqual(line, nd.text)
+            self.assertEqual(lines[nd.line], nd.text)
+            self.assertTrue(0.1 <= nd.depth <= 0.9)
+
+    def test_seed_is_deterministic(self):
+        other = os.path.join(self.tmp, "h2.txt")
+        t1 = self.hs.generate_haystack(self.path, 2000, needles=["42"], depth=[0.5], seed=3)
+        t2 = self.hs.generate_haystack(other, 2000, needles=["42"], depth=[0.5], seed=3)
+        with open(self.path, "rb") as a, open(other, "rb") as b:
+            self.assertEqual(a.read(), b.read())
+        self.assertEqual(t1.needles[0].line, 1000)
+        self.assertEqual(t2.needles[0].value, "42")
+
+    def test_document_structure(self):
+        truth = self.hs.generate_haystack(self.path, 3000, needles=2, docs=3, seed=1, truth_path=self.path + ".json")
+        _, lines = self._read_lines()
+        self.assertEqual(len(truth.docs), 3)
+        for d in truth.docs:
+            self.assertEqual(lines[d["line"]], "THE FEDERALIST.")
+            self.assertEqual(lines[d["line"] + 1], f"No. {self.hs.to_roman(d['number'])}.")
+            self.assertIn(d["author"], self.hs.AUTHORS)
+        for nd in truth.needles:
+            self.assertEqual(lines[nd.line], nd.text)
+            self.assertLessEqual(truth.docs[nd.doc]["line"], nd.line)
+        self.assertTrue(os.path.exists(self.path + ".json"))
+
+    def test_colliding_needles_are_all_kept(self):
+        truth = self.hs.generate_haystack(self.path, 20, needles=8, depth_range=(0.5, 0.55), seed=2, backend="python")
+        self.assertEqual([nd.index for nd in truth.needles], list(range(8)))
+        self.assertEqual(len({nd.line for nd in truth.needles}), 8)
+        _, lines = self._read_lines()
+        for nd in truth.needles:
+            self.assertEqual(lines[nd.line], nd.text)
+        with self.assertRaises(ValueError):
+            self.hs.generate_haystack(self.path, 100, needles=["1", "2"], depth=[0.5, 0.5])
+
+    @unittest.skipUnless(__import__("importlib").util.find_spec("numpy"), "numpy not installed")
+    def test_numpy_backend(self):
+        truth = self.hs.generate_haystack(self.path, 5000, needles=3, docs=2, seed=5, chunk_lines=700, backend="numpy")
+        self.assertEqual(truth.backend, "numpy")
+        data, lines = self._read_lines()
+        self.assertEqual(truth.num_bytes, len(data))
+        self.assertEqual(data.count(b"\n"), truth.num_lines)
+        for nd, line in self.hs.iter_needle_lines(self.path, truth):
+            self.assertEqual(line, nd.text)
+            self.assertEqual(lines[nd.line], nd.text)
+        # Body lines are lowercase prose; headers and needles start uppercase
+        body = [ln for ln in lines if ln[:1].islower()]
+        self.assertGreater(len(body), 4000)
+        self.assertTrue(all(w in self.hs.PROSE_WORDS for ln in body for w in ln.split()))
+
+
+if __name__ == "__main__":
+    unittest.main()
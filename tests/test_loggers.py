@@ -0,0 +1,121 @@
+import io
+import os
+import sys
+import threading
+import unittest
+
+
+_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, os.path.join(_ROOT, "vendor", "rlm"))
+
+try:
+    import rich  # noqa: F401
+    HAS_RICH = True
+except Exception:
+    HAS_RICH = False
+
+
+class TestAsyncRenderer(unittest.TestCase):
+    def setUp(self):
+        from rlm.logger.async_renderer import AsyncRenderer
+
+        self.AsyncRenderer = AsyncRenderer
+
+    def _blocked(self, policy, max_queue=2):
+        """A renderer whose thread is stuck on a first job until `gate` is set."""
+        r = self.AsyncRenderer(max_queue=max_queue, policy=policy, block_timeout_s=0.05, stream=io.StringIO())
+        gate, started = threading.Event(), threading.Event()
+        r.submit(lambda: (started.set(), gate.wait()))
+        started.wait(5)
+        return r, gate
+
+    def test_records_render_in_order(self):
+        out = []
+        r = self.AsyncRenderer(stream=io.StringIO())
+        for i in range(50):
+            r.submit(lambda i=i: out.append(i))
+        self.assertTrue(r.flush(5))
+        self.assertEqual(out, list(range(50)))
+        r.close()
+
+    def test_drop_old_keeps_latest(self):
+        out = []
+        r, gate = self._blocked("drop_old")
+        for i in range(5):
+            self.assertTrue(r.submit(lambda i=i: out.append(i)))
+        gate.set()
+        r.flush(5)
+        self.assertEqual(out, [3, 4])
+        self.assertEqual(r.dropped, 3)
+        self.assertIn("3 record(s) dropped", r.stream.getvalue())
+
+    def test_drop_new_keeps_earliest(self):
+        out = []
+        r, gate = self._blocked("drop_new")
+        results = [r.submit(lambda i=i: out.append(i)) for i in range(5)]
+        gate.set()
+        r.flush(5)
+        self.assertEqual(out, [0, 1])
+        self.assertEqual(results, [True, True, False, False, False])
+
+    def test_block_applies_backpressure_then_drops(self):
+        r, gate = self._blocked("block", max_queue=1)
+        self.assertTrue(r.submit(lambda: None))
+        self.assertFalse(r.submit(lambda: None))  # waited block_timeout_s, still full
+        gate.set()
+        self.assertTrue(r.submit(lambda: None))
+        r.flush(5)
+        self.assertEqual(r.dropped, 1)
+
+    def test_broken_job_does_not_stop_renderer(self):
+        out = []
+        r = self.AsyncRenderer(stream=io.StringIO())
+        r.submit(lambda: 1 / 0)
+        r.submit(lambda: out.append("ok"))
+        r.flush(5)
+        self.assertEqual(out, ["ok"])
+
+    def test_unknown_policy(self):
+        with self.assertRaises(ValueError):
+            self.AsyncRenderer(policy="nope")
+
+
+class TestColorfulLogger(unittest.TestCase):
+    def test_async_output_matches_sync(self):
+        from rlm.logger.async_renderer import AsyncRenderer
+        from rlm.logger.root_logger import ColorfulLogger
+
+        def run(logger):
+            logger.log_model_response("x" * 600, has_tool_calls=True)
+            logger.log_tool_execution("CODE_EXECUTION", "result")
+            logger.log_final_response("done")
+
+        sync_out = io.StringIO()
+        sys_stdout, sys.stdout = sys.stdout, sync_out
+        try:
+            run(ColorfulLogger())
+        finally:
+            sys.stdout = sys_stdout
+
+        renderer = AsyncRenderer(stream=io.StringIO())
+        run(ColorfulLogger(renderer=renderer))
+        renderer.flush(5)
+        self.assertEqual(renderer.stream.getvalue(), sync_out.getvalue())
+        self.assertIn("MODEL RESPONSE (Step 1)", sync_out.getvalue())
+
+
+@unittest.skipUnless(HAS_RICH, "rich not installed")
+class TestREPLEnvLogger(unittest.TestCase):
+    def test_history_is_bounded_and_truncated(self):
+        from rlm.logger.repl_logger import REPLEnvLogger
+
+        logger = REPLEnvLogger(enabled=False, max_history=3, max_output_length=100)
+        for i in range(10):
+            logger.log_execution(f"print({i})", "y" * 10_000)
+        self.assertEqual(len(logger.executions), 3)
+        self.assertEqual(logger.executions[-1].execution_number, 10)
+        self.assertLess(len(logger.executions[-1].stdout), 200)
+
+
+if __name__ == "__main__":
+    unittest.main()
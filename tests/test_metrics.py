@@ -0,0 +1,96 @@
+import json
+import os
+import sys
+import tempfile
+import unittest
+import urllib.request
+
+
+_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, os.path.join(_ROOT, "vendor", "rlm"))
+sys.path.insert(0, _ROOT)
+
+from rlm_utils.metrics import MetricsRegistry, SnapshotWriter, get_metrics, serve_metrics  # noqa: E402
+
+
+class TestMetricsRegistry(unittest.TestCase):
+    def setUp(self):
+        self.m = MetricsRegistry(buckets=(0.1, 1.0, 10.0))
+
+    def test_histogram_buckets_and_quantiles(self):
+        for v in (0.05, 0.5, 0.5, 0.5, 5.0):
+            self.m.observe("rlm_code_exec_seconds", v, depth=0)
+        (series,) = self.m.snapshot()["histograms"]["rlm_code_exec_seconds"]
+        self.assertEqual(series["labels"], {"depth": "0"})
+        self.assertEqual(series["count"], 5)
+        self.assertAlmostEqual(series["sum"], 6.55)
+        self.assertTrue(0.1 < series["p50"] <= 1.0)
+        self.assertTrue(1.0 < series["p95"] <= 10.0)
+
+    def test_prometheus_text(self):
+        self.m.observe("rlm_root_call_seconds", 0.5, model="m", depth=1)
+        self.m.inc("rlm_tokens_total", 12, model="m", depth=1, kind="prompt")
+        text = self.m.render_prometheus()
+        self.assertIn("# TYPE rlm_root_call_seconds histogram", text)
+        self.assertIn('rlm_root_call_seconds_bucket{model="m",depth="1",le="0.1"} 0', text)
+        self.assertIn('rlm_root_call_seconds_bucket{model="m",depth="1",le="+Inf"} 1', text)
+        self.assertIn('rlm_root_call_seconds_count{model="m",depth="1"} 1', text)
+        self.assertIn('rlm_tokens_total{model="m",depth="1",kind="prompt"} 12', text)
+
+    def test_track_counts_inflight_and_sets_depth(self):
+        with self.m.track("rlm_sub_call_seconds", stage="sub", model="s", depth=2):
+            self.m.inc("rlm_tokens_total", 3, model="s", kind="completion")
+            inflight = self.m.snapshot()["values"]["rlm_inflight"]
+            self.assertEqual(inflight, [{"labels": {"stage": "sub", "depth": "2"}, "value": 1}])
+        snap = self.m.snapshot()
+        self.assertEqual(snap["values"]["rlm_inflight"][0]["value"], 0)
+        self.assertEqual(snap["values"]["rlm_tokens_total"][0]["labels"]["depth"], "2")
+        with self.m.depth_scope(4):
+            self.m.inc("rlm_tokens_total", 1, model="s", kind="prompt")
+        depths = {s["labels"]["depth"] for s in self.m.snapshot()["values"]["rlm_tokens_total"]}
+        self.assertEqual(depths, {"2", "4"})
+
+    def test_snapshot_writer_is_atomic_json(self):
+        self.m.inc("rlm_sub_cache_requests_total", 3, result="hit")
+        self.m.inc("rlm_sub_cache_requests_total", 1, result="miss")
+        with tempfile.TemporaryDirectory() as d:
+            path = os.path.join(d, "metrics.json")
+            writer = SnapshotWriter(path, interval_s=0.01, registry=self.m).start()
+            writer.stop()
+            with open(path) as f:
+                snap = json.load(f)
+            self.assertEqual(snap["sub_cache_hit_rate"], 0.75)
+            self.assertFalse(os.path.exists(path + ".tmp"))
+
+    def test_http_endpoint(self):
+        self.m.inc("rlm_exec_limit_total", limit="wall")
+        server = serve_metrics(port=0, registry=self.m)
+        try:
+            url = f"http://127.0.0.1:{server.server_address[1]}/metrics"
+            with urllib.request.urlopen(url, timeout=5) as resp:
+                body = resp.read().decode()
+        finally:
+            server.shutdown()
+        self.assertIn('rlm_exec_limit_total{limit="wall"} 1', body)
+
+
+class TestREPLInstrumentation(unittest.TestCase):
+    def test_sub_calls_exec_and_cache_are_recorded(self):
+        import rlm.repl as repl_mod
+        from test_repl_env import DummySubRLM
+
+        repl_mod.Sub_RLM = DummySubRLM
+        metrics = get_metrics()
+        metrics.reset()
+        env = repl_mod.REPLEnv(recursive_model="dummy", sub_cache=repl_mod.SubLLMCache(), depth=1)
+        env.code_execution("a = llm_query('hi')\nb = llm_query('hi')")
+        snap = metrics.snapshot()
+        (sub,) = snap["histograms"]["rlm_sub_call_seconds"]
+        self.assertEqual((sub["labels"], sub["count"]), ({"model": "dummy", "depth": "2"}, 1))
+        exec_depths = {s["labels"]["depth"] for s in snap["histograms"]["rlm_code_exec_seconds"]}
+        self.assertIn("1", exec_depths)
+        self.assertEqual(snap["sub_cache_hit_rate"], 0.5)
+
+
+if __name__ == "__main__":
+    unittest.main()
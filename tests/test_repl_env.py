@@ -74,6 +74,380 @@ class TestREPLEnvironment(unittest.TestCase):
         self.assertIn(self.env.temp_dir, r.stdout)
 
 
+class TestREPLFork(unittest.TestCase):
+    def setUp(self):
+        import rlm.repl as repl_mod
+
+        repl_mod.Sub_RLM = DummySubRLM
+        self.repl_mod = repl_mod
+        self.base = repl_mod.REPLEnv(
+            recursive_model="dummy",
+            context_str="line one\nline two",
+            setup_code="index = {'lines': context.split('\\n')}\nopen('notes.txt', 'w').write('warm')",
+        )
+
+    def test_fork_shares_context_and_setup_state(self):
+        child = self.base.fork()
+        self.assertIs(child.locals["context"], self.base.locals["context"])
+        self.assertEqual(child.locals["index"], {"lines": ["line one", "line two"]})
+        self.assertNotEqual(child.temp_dir, self.base.temp_dir)
+        r = child.code_execution("print(open('notes.txt').read())")
+        self.assertIn("warm", r.stdout)
+
+    def test_fork_mutations_are_isolated(self):
+        a = self.base.fork()
+        b = self.base.fork()
+        a.code_execution("index['lines'].append('extra')\nanswer = 'a'")
+        self.assertEqual(len(b.locals["index"]["lines"]), 2)
+        self.assertEqual(len(self.base.locals["index"]["lines"]), 2)
+        self.assertNotIn("answer", b.locals)
+        r = b.code_execution("print(FINAL_VAR('answer'))")
+        self.assertIn("not found", r.stdout)
+
+    def test_share_setup_state(self):
+        base = self.repl_mod.REPLEnv(
+            recursive_model="dummy",
+            context_str="line one\nline two",
+            setup_code="index = {'lines': context.split('\\n')}",
+            share_setup=True,
+        )
+        a = base.fork()
+        self.assertIs(a.locals["index"], base.locals["index"])
+        # Shared names carry over to forks of forks; later variables are still copied
+        a.code_execution("seen = []")
+        b = a.fork()
+        self.assertIs(b.locals["index"], base.locals["index"])
+        self.assertIsNot(b.locals["seen"], a.locals["seen"])
+        # An explicit `shared` overrides the env's default
+        self.assertIsNot(base.fork(shared=("context",)).locals["index"], base.locals["index"])
+
+    def test_concurrent_forks_capture_their_own_output(self):
+        import threading
+
+        forks = [self.base.fork() for _ in range(4)]
+        results = {}
+
+        def run(i, env):
+            code = f"print('start-{i}')\nr = llm_query('q{i}')\nprint('end-{i}', r)"
+            results[i] = env.code_execution(code)
+
+        threads = [threading.Thread(target=run, args=(i, env)) for i, env in enumerate(forks)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        for i, env in enumerate(forks):
+            out = results[i].stdout
+            self.assertIn(f"start-{i}", out)
+            self.assertIn(f"end-{i} ECHO: q{i}", out)
+            for j in range(4):
+                if j != i:
+                    self.assertNotIn(f"-{j}", out)
+
+    def test_other_threads_output_is_not_captured(self):
+        import io
+        import threading
+
+        env = self.base.fork()
+        env.locals["go"], env.locals["done"] = threading.Event(), threading.Event()
+
+        def progress():
+            env.locals["go"].wait(5)
+            print("progress line")
+            env.locals["done"].set()
+
+        terminal, saved = io.StringIO(), sys.stdout
+        sys.stdout = terminal
+        try:
+            t = threading.Thread(target=progress)
+            t.start()
+            r = env.code_execution("print('mine')\ngo.set()\ndone.wait(5)\nprint(llm_query('q'))")
+            t.join()
+            print("after")
+        finally:
+            sys.stdout = saved
+        self.assertIn("mine", r.stdout)
+        self.assertIn("ECHO: q", r.stdout)
+        self.assertNotIn("progress line", r.stdout)
+        self.assertEqual(terminal.getvalue(), "progress line\nafter\n")
+
+
+class TestSubLLMCache(unittest.TestCase):
+    def test_forks_share_sub_llm_cache(self):
+        import rlm.repl as repl_mod
+
+        calls = []
+
+        class CountingSubRLM(DummySubRLM):
+            def completion(self, prompt):
+                calls.append(prompt)
+                return super().completion(prompt)
+
+        repl_mod.Sub_RLM = CountingSubRLM
+        cache = repl_mod.SubLLMCache()
+        base = repl_mod.REPLEnv(recursive_model="dummy", context_str="ctx", sub_cache=cache)
+        a, b = base.fork(), base.fork()
+        ra = a.code_execution("print(llm_query_text(context, 'summarize'))")
+        rb = b.code_execution("print(llm_query_text(context, 'summarize'))")
+        self.assertEqual(ra.stdout, rb.stdout)
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(cache.stats(), {"hits": 1, "misses": 1, "entries": 1})
+
+    def test_error_answers_are_not_cached(self):
+        import rlm.repl as repl_mod
+
+        cache = repl_mod.SubLLMCache()
+        answers = iter(["Error making LLM query: boom", "ok"])
+        self.assertTrue(cache.get_or_compute("p", lambda: next(answers)).startswith("Error"))
+        self.assertEqual(cache.get_or_compute("p", lambda: next(answers)), "ok")
+
+
+class TestBoundedOutput(unittest.TestCase):
+    def setUp(self):
+        import rlm.repl as repl_mod
+
+        repl_mod.Sub_RLM = DummySubRLM
+        self.repl_mod = repl_mod
+        self.env = repl_mod.REPLEnv(recursive_model="dummy", max_output_chars=1000, keep_spills=2)
+
+    def test_small_output_is_untouched(self):
+        r = self.env.code_execution("print('hello')")
+        self.assertEqual(r.stdout, "hello\n")
+        self.assertEqual(r.stdout_chars, 6)
+        self.assertIsNone(r.stdout_path)
+
+    def test_large_output_is_bounded_and_spilled(self):
+        r = self.env.code_execution("for i in range(20000):\n    print(i)")
+        expected = "".join(f"{i}\n" for i in range(20000))
+        self.assertEqual(r.stdout_chars, len(expected))
+        self.assertLess(len(r.stdout), 1200)
+        self.assertTrue(r.stdout.startswith("0\n1\n2\n"))
+        self.assertTrue(r.stdout.endswith("19998\n19999\n"))
+        self.assertIn("TRUNCATED", r.stdout)
+        with open(r.stdout_path) as f:
+            self.assertEqual(f.read(), expected)
+        # The REPL can reach the full output through the handle
+        r2 = self.env.code_execution("print(len(open(_stdout_path).read()))")
+        self.assertIn(str(len(expected)), r2.stdout)
+
+    def test_old_spill_files_are_pruned(self):
+        paths = [self.env.code_execution("print('x' * 5000)").stdout_path for _ in range(3)]
+        self.assertFalse(os.path.exists(paths[0]))
+        self.assertTrue(all(os.path.exists(p) for p in paths[1:]))
+
+    def test_single_huge_write(self):
+        buf = self.repl_mod.BoundedOutput(200)
+        buf.write("a" * 10 + "b" * 2000 + "c" * 10)
+        value = buf.getvalue()
+        self.assertTrue(value.startswith("a" * 10 + "b" * 90))
+        self.assertTrue(value.endswith("b" * 20 + "c" * 10))
+        self.assertLessEqual(len(value), 200)  # marker included
+        self.assertIn("TRUNCATED", value)
+        self.assertEqual(buf.total_chars, 2020)
+
+    def test_oversized_write_is_never_copied_whole(self):
+        import tracemalloc
+
+        big = "x" * 20_000_000
+        for spill in (None, os.path.join(self.env.temp_dir, "big.txt")):
+            buf = self.repl_mod.BoundedOutput(1000, spill_path=spill)
+            buf.write("head\n")
+            tracemalloc.start()
+            try:
+                buf.write(big)
+                _, peak = tracemalloc.get_traced_memory()
+            finally:
+                tracemalloc.stop()
+            buf.close()
+            retained = len(buf._head) + sum(len(p) for p in buf._tail)
+            self.assertLessEqual(retained, 1000)
+            # A copy of `big` would be 20 MB; spilling goes through 1 MB slices
+            self.assertLess(peak, 4_000_000)
+            self.assertEqual(buf.total_chars, len(big) + 5)
+            if spill:
+                self.assertEqual(os.path.getsize(spill), len(big) + 5)
+
+    def test_default_bounds_fit_the_message_cap(self):
+        from rlm.utils import utils
+
+        env = self.repl_mod.REPLEnv(recursive_model="dummy")
+        code = "import sys\nrows = list(range(50))\nprint('x' * 500_000)\nprint('boom' * 50_000, file=sys.stderr)"
+        r = env.code_execution(code)
+        formatted = utils.format_execution_result(r.stdout, r.stderr, r.locals, digests=env.var_digests)
+        self.assertLessEqual(len(formatted), utils.MAX_RESULT_CHARS)
+        content = utils.add_execution_result_to_messages([], code, formatted)[0]["content"]
+        # Nothing is cut again: the spill marker, stderr and the variable table all survive
+        self.assertEqual(content.count("TRUNCATED"), 2)
+        self.assertIn(r.stdout_path, content)
+        self.assertTrue(content.rstrip().endswith(formatted.rstrip().splitlines()[-1]))
+        self.assertIn("rows", content)
+
+    def test_message_layer_cuts_the_middle(self):
+        from rlm.utils import utils
+
+        content = utils.add_execution_result_to_messages([], "x", "a" * 500 + "END", max_character_length=200)[0]["content"]
+        self.assertTrue(content.endswith("END"))
+        self.assertIn("TRUNCATED", content)
+
+
+class TestExecLimits(unittest.TestCase):
+    def setUp(self):
+        import rlm.repl as repl_mod
+
+        repl_mod.Sub_RLM = DummySubRLM
+        self.repl_mod = repl_mod
+
+    def _env(self, **limits):
+        return self.repl_mod.REPLEnv(
+            recursive_model="dummy", context_str="hello", limits=self.repl_mod.ExecLimits(**limits)
+        )
+
+    def test_runaway_loop_hits_wall_limit(self):
+        env = self._env(wall_s=0.3)
+        # A bare except in model code must not swallow the interrupt
+        r = env.code_execution("n = 0\nwhile True:\n    try:\n        n += 1\n    except:\n        pass")
+        self.assertEqual(r.limit, "wall_time")
+        self.assertIn("ResourceLimitExceeded(wall_time)", r.stderr)
+        self.assertLess(r.execution_time, 5)
+        # The session stays usable afterwards
+        r2 = env.code_execution("print(len(context))")
+        self.assertIsNone(r2.limit)
+        self.assertIn("5", r2.stdout)
+
+    def test_cpu_limit(self):
+        if not hasattr(self.repl_mod.time, "pthread_getcpuclockid"):
+            self.skipTest("no per-thread CPU clock")
+        env = self._env(cpu_s=0.3)
+        r = env.code_execution("s = 0\nfor i in range(10 ** 10):\n    s += i")
+        self.assertEqual(r.limit, "cpu_time")
+
+    def test_fast_code_is_unaffected(self):
+        env = self._env(wall_s=5, cpu_s=5, memory_mb=512)
+        r = env.code_execution("x = [i * 2 for i in range(1000)]\nsum(x)")
+        self.assertIsNone(r.limit)
+        self.assertIn("999000", r.stdout)
+        self.assertEqual(len(env.locals["x"]), 1000)
+
+    @unittest.skipUnless(hasattr(os, "fork"), "process isolation needs fork()")
+    def test_process_isolation(self):
+        env = self._env(wall_s=2, isolation="process")
+        r = env.code_execution(
+            "import re\n"
+            "def shout(s):\n"
+            "    return re.sub('l', 'L', s)\n"
+            "words = [shout(context)]\n"
+            "answer = llm_query('hi')"
+        )
+        self.assertIsNone(r.limit, r.stderr)
+        self.assertEqual(env.locals["words"], ["heLLo"])
+        self.assertEqual(env.locals["answer"], "ECHO: hi")
+        # Functions and modules are rebuilt in the parent by replaying their definitions
+        self.assertEqual(env.locals["shout"]("ll"), "LL")
+        self.assertIn("re", env.globals)
+
+        # SIGALRM in the worker stops a blocking call the thread watchdog would wait out;
+        # progress made before the stop is sent back as usual
+        r = env.code_execution("import time\nwords.append(1)\ntime.sleep(30)")
+        self.assertEqual(r.limit, "wall_time")
+        self.assertLess(r.execution_time, 10)
+        self.assertEqual(env.locals["words"], ["heLLo", 1])
+
+    @unittest.skipUnless(hasattr(os, "fork"), "process isolation needs fork()")
+    def test_process_isolation_sends_back_touched_names_only(self):
+        env = self.repl_mod.REPLEnv(
+            recursive_model="dummy",
+            context_json=list(range(100_000)),
+            limits=self.repl_mod.ExecLimits(wall_s=5, isolation="process"),
+        )
+        context = env.locals["context"]
+        env.code_execution("items = []\nother = {'a': 1}")
+        items, other = env.locals["items"], env.locals["other"]
+        r = env.code_execution("x = len(context)")
+        self.assertIsNone(r.limit, r.stderr)
+        self.assertEqual(env.locals["x"], 100_000)
+        # A step that touched no existing mutable variable leaves them (and context) alone
+        self.assertIs(env.locals["items"], items)
+        self.assertIs(env.locals["other"], other)
+        self.assertIs(env.locals["context"], context)
+        env.code_execution("items.append(2)\nfirst = [context]")
+        self.assertEqual(env.locals["items"], [2])
+        # The shared context is never resent, and references to it stay shared
+        self.assertIs(env.locals["context"], context)
+        self.assertIs(env.locals["first"][0], context)
+        # A function from an earlier step may mutate anything, so everything is sent back
+        env.code_execution("def tag(v):\n    other['b'] = v")
+        env.code_execution("tag(3)")
+        self.assertEqual(env.locals["other"], {"a": 1, "b": 3})
+        # Rebinding a shared name is still carried over
+        env.code_execution("context = context[:3]")
+        self.assertEqual(env.locals["context"], [0, 1, 2])
+
+    @unittest.skipUnless(hasattr(os, "fork"), "process isolation needs fork()")
+    def test_process_isolation_matches_thread_mode(self):
+        steps = [
+            "a = []\nb = a",
+            "holder = {'k': a}",
+            "holder['k'].append(1)",
+            "import functools\nadd = functools.partial(b.append, 2)",
+            # Calls through an object from an earlier step may reach any variable
+            "add()",
+        ]
+        envs = [self._env(wall_s=5, isolation=mode) for mode in ("thread", "process")]
+        for env in envs:
+            for code in steps:
+                r = env.code_execution(code)
+                self.assertIsNone(r.limit, r.stderr)
+        for env in envs:
+            loc = env.locals
+            self.assertEqual(loc["a"], [1, 2])
+            self.assertIs(loc["a"], loc["b"])
+            self.assertIs(loc["holder"]["k"], loc["a"])
+            self.assertIs(loc["add"].func.__self__, loc["a"])
+
+    @unittest.skipUnless(hasattr(os, "fork"), "process isolation needs fork()")
+    def test_lost_changes_are_reported(self):
+        env = self._env(wall_s=5, isolation="process")
+        import threading
+
+        env.locals["lock"], env.locals["held"] = threading.Lock(), []
+        r = env.code_execution("held.append(lock.acquire())")
+        self.assertEqual(env.locals["held"], [True])
+        self.assertIn("changes this step made to them", r.stderr)
+        self.assertIn("lock", r.stderr)
+
+    @unittest.skipUnless(hasattr(os, "fork"), "process isolation needs fork()")
+    def test_worker_is_killed_without_wall_limit(self):
+        # Stands in for a worker stuck on a lock it inherited at fork
+        env = self._env(isolation="process", worker_timeout_s=0.5)
+        r = env.code_execution("import threading\nthreading.Event().wait()")
+        self.assertEqual(r.limit, "wall_time")
+        self.assertIn("worker time limit of 0.5s", r.stderr)
+        self.assertLess(r.execution_time, 5)
+
+    @unittest.skipUnless(hasattr(os, "fork"), "process isolation needs fork()")
+    def test_sigkill_is_not_reported_as_cpu_time(self):
+        env = self._env(wall_s=5, cpu_s=5, isolation="process")
+        r = env.code_execution("import os, signal\nos.kill(os.getpid(), signal.SIGKILL)")
+        self.assertEqual(r.limit, "memory")
+        self.assertIn("worker was killed", r.stderr)
+
+    @unittest.skipUnless(os.path.exists("/proc/self/statm"), "needs /proc RSS")
+    def test_memory_is_not_charged_while_paused(self):
+        guard = self.repl_mod._Watchdog(self.repl_mod.ExecLimits(memory_mb=64, poll_s=60))
+        guard.start()
+        try:
+            # Another session's allocation while this one waits on a sub-LLM call
+            guard.pause()
+            other = b"x" * (128 * 1024 * 1024)
+            guard.resume()
+            self.assertIsNone(guard._over())
+            mine = b"y" * (128 * 1024 * 1024)
+            self.assertIs(guard._over(), self.repl_mod.MemoryLimitExceeded)
+        finally:
+            guard.stop()
+        del other, mine
+
+
 class TestUtils(unittest.TestCase):
     def setUp(self):
         # Import utils module directly (safe: no external deps)
@@ -92,6 +466,56 @@ class TestUtils(unittest.TestCase):
         self.assertEqual(self.utils.find_final_answer(t1)[0], "FINAL")
         self.assertEqual(self.utils.find_final_answer(t2)[0], "FINAL_VAR")
 
+    def test_final_answer_balances_parentheses(self):
+        text = "Done.\n  FINAL(f(x) = 2 (approx.)) trailing) text"
+        self.assertEqual(self.utils.find_final_answer(text), ("FINAL", "f(x) = 2 (approx.)"))
+        # Unbalanced arguments stop at the last ')'; markers must start a line
+        self.assertEqual(self.utils.find_final_answer("FINAL(a :-( b) c"), ("FINAL", "a :-( b"))
+        self.assertIsNone(self.utils.find_final_answer("print(FINAL(1))"))
+        self.assertEqual(self.utils.find_final_answer("FINAL(1)\nFINAL_VAR(ans)")[0], "FINAL_VAR")
+
+    def test_streamed_chunks_match_whole_parse(self):
+        text = (
+            "Plan (step 1):\n```repl\nx = len(context)\nprint(x)\n```\n"
+            "```python\nnot_run()\n```\n```repl   \ny = (1, (2, 3))\n```\nFINAL(x is (roughly) 10)\n"
+        )
+        whole = self.utils.parse_response(text)
+        self.assertEqual(whole.code_blocks, ["x = len(context)\nprint(x)", "y = (1, (2, 3))"])
+        self.assertEqual(whole.final, ("FINAL", "x is (roughly) 10"))
+        for size in (1, 2, 3, 7):
+            parser = self.utils.ResponseParser()
+            done = []
+            for i in range(0, len(text), size):
+                done += parser.feed(text[i:i + size])
+            parser.close()
+            self.assertEqual(done, whole.code_blocks)
+            self.assertEqual(parser.final, whole.final)
+
+    def test_variable_digest_table(self):
+        import re
+        from rlm.utils.digest import VariableDigests
+
+        digests = VariableDigests(preview_chars=40)
+        summaries = [f"summary {i} " + "x" * 200 for i in range(10_000)]
+        loc = {"summaries": summaries, "n": 3, "pat": re.compile("a"), "re": re, "_tmp": 1, "f": len}
+        out = self.utils.format_execution_result("hi", "", loc, digests=digests)
+        lines = out.split("REPL variables:\n")[1].strip().splitlines()
+        self.assertEqual(lines[0].split(), ["name", "type", "len", "size", "preview"])
+        rows = {line.split()[0]: line for line in lines[1:]}
+        self.assertEqual(set(rows), {"summaries", "n", "pat"})
+        self.assertEqual(rows["summaries"].split()[1:3], ["list", "10000"])
+        self.assertTrue(rows["summaries"].split()[3].endswith("MB"))  # ~10k * 250B strings
+        self.assertIn("['summa", rows["summaries"])
+        self.assertLessEqual(len(rows["summaries"].split("  ")[-1].strip()), 40)
+        self.assertIn("<Pattern>", rows["pat"])
+        # Unchanged values come from the cache; in-place growth is picked up
+        self.utils.format_execution_result("", "", loc, digests=digests)
+        self.assertEqual((digests.hits, digests.misses), (3, 3))
+        summaries.append("more")
+        out = self.utils.format_execution_result("", "", loc, digests=digests)
+        self.assertIn("10001", out)
+        self.assertEqual(digests.misses, 4)
+
 
 if __name__ == "__main__":
     unittest.main()